@@ -0,0 +1,66 @@
+from .backend import CacheBackend, MemoryBackend
+from .comments import CommentCache
+from .context import bypass_cache, cache_bypassed
+from .cover import CoverCache, make_thumbnail
+from .cz import CZCardCache
+from .disk import DiskStore
+from .enrichment import ENRICHMENT, Enrichment, EnrichmentCache, estimate_url_expiry
+from .hub import CacheHub
+from .lyrics import LyricsStore
+from .lyrics_images import LyricsImageCache
+from .media import MediaHandleCache
+from .memory import MISSING, TTLCache
+from .namespace import BACKENDS, CacheNamespace, open_namespace
+from .remote import KEY_PREFIX, RedisBackend, RedisError, close_redis, connect_redis
+from .search import SearchCache
+from .selection_images import SelectionImageCache
+from .serde import COMMENTS, JSON, RAW, SONGS, TEXT, Codec, pack, unpack
+from .songs import SongRecord, SongStore
+from .sqlite import SqliteStore
+from .stats import CacheStats
+from .tiles import TileCache
+
+__all__ = [
+    "BACKENDS",
+    "COMMENTS",
+    "ENRICHMENT",
+    "JSON",
+    "KEY_PREFIX",
+    "MISSING",
+    "RAW",
+    "SONGS",
+    "TEXT",
+    "CZCardCache",
+    "CacheBackend",
+    "CacheHub",
+    "CacheNamespace",
+    "CacheStats",
+    "Codec",
+    "CommentCache",
+    "CoverCache",
+    "DiskStore",
+    "Enrichment",
+    "EnrichmentCache",
+    "LyricsImageCache",
+    "LyricsStore",
+    "MediaHandleCache",
+    "MemoryBackend",
+    "RedisBackend",
+    "RedisError",
+    "SearchCache",
+    "SelectionImageCache",
+    "SongRecord",
+    "SongStore",
+    "SqliteStore",
+    "TTLCache",
+    "TileCache",
+    "bypass_cache",
+    "cache_bypassed",
+    "close_redis",
+    "connect_redis",
+    "estimate_url_expiry",
+    "make_thumbnail",
+    "open_namespace",
+    "pack",
+    "unpack",
+]
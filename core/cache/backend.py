@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any, ClassVar
+
+from .memory import MISSING, TTLCache
+from .stats import CacheStats
+
+
+class CacheBackend(ABC):
+    """
+    缓存后端的统一接口
+    键为字符串；内存后端直接保存对象，持久化后端只接受 bytes，
+    由 CacheNamespace 负责序列化
+    """
+
+    persistent: ClassVar[bool] = True
+    """ 是否需要把值序列化成 bytes """
+
+    stats: CacheStats
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """读取缓存，未命中或已过期时返回 None"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """写入缓存，ttl 为 None 时使用后端的默认有效期"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """删除缓存"""
+
+    async def close(self) -> None:
+        """释放后端占用的资源"""
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[bool]:
+        """
+        跨进程的单飞锁，yield 是否等待过其他持有者
+        只有多个节点共用的后端才需要实现，其余后端直接放行
+        """
+        yield False
+
+
+class MemoryBackend(CacheBackend):
+    """进程内 LRU/TTL 后端"""
+
+    persistent = False
+
+    def __init__(
+        self,
+        max_weight: int,
+        ttl: float | None = None,
+        weigher: Callable[[Any], int] | None = None,
+    ):
+        self.store = TTLCache(max_weight=max_weight, ttl=ttl, weigher=weigher)
+        self.by_bytes = weigher is len
+
+    @property
+    def stats(self) -> CacheStats:
+        stats = self.store.stats
+        if self.by_bytes:
+            stats.bytes = stats.weight
+        return stats
+
+    async def get(self, key: str) -> Any | None:
+        value = self.store.get(key)
+        return None if value is MISSING else value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.store.set(key, value, ttl=MISSING if ttl is None else ttl)
+
+    async def delete(self, key: str) -> None:
+        self.store.pop(key)
@@ -0,0 +1,45 @@
+from pathlib import Path
+from typing import Any
+
+from ..config import CommentCacheConfig
+from ..model import Comment, Song
+from .namespace import open_namespace
+from .serde import COMMENTS
+
+
+class CommentCache:
+    """
+    热评缓存
+    按 (来源, 歌曲ID) 只保存精简后的评论记录，各网易云通道共用
+    """
+
+    def __init__(
+        self, config: CommentCacheConfig, data_dir: Path, redis: Any | None = None
+    ):
+        self.cfg = config
+        self.store = open_namespace(
+            "comments",
+            COMMENTS,
+            backend=config.backend,
+            data_dir=data_dir,
+            redis=redis,
+            max_entries=config.max_entries,
+            max_mb=config.max_mb,
+            ttl=config.ttl,
+        )
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    @staticmethod
+    def make_key(source: str, song_id: str | int) -> str:
+        return f"{source}:{song_id}"
+
+    async def get(self, key: str) -> list[Comment] | None:
+        return await self.store.get(key)
+
+    async def put(self, key: str, song: Song) -> None:
+        if song.comments:
+            # 记录是不可变的小对象，内存后端直接共享同一个列表
+            await self.store.set(key, song.comments)
@@ -0,0 +1,19 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_bypass: ContextVar[bool] = ContextVar("music_cache_bypass", default=False)
+
+
+def cache_bypassed() -> bool:
+    return _bypass.get()
+
+
+@contextmanager
+def bypass_cache() -> Iterator[None]:
+    """Skip cache reads inside the block (results are still written back)."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
@@ -0,0 +1,89 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from ..config import CoverCacheConfig
+from .namespace import open_namespace
+from .serde import RAW
+
+
+def make_thumbnail(data: bytes, size: tuple[int, int]) -> Image.Image:
+    """
+    解码并缩放封面
+    JPEG 用 draft 模式在解码阶段直接按 2 的幂缩小，
+    不会先还原出 1000x1000 的整图再缩放
+    """
+    image = Image.open(BytesIO(data))
+    image.draft("RGB", size)
+    return image.convert("RGB").resize(size)
+
+
+def _encode(image: Image.Image) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _decode(data: bytes) -> Image.Image:
+    image = Image.open(BytesIO(data))
+    image.load()
+    return image
+
+
+class CoverCache:
+    """
+    封面缩略图缓存（默认存在磁盘上）
+    按 (封面 URL, 目标尺寸) 保存已缩放好的 JPEG，命中时无需下载也无需整图解码
+    """
+
+    def __init__(
+        self, config: CoverCacheConfig, data_dir: Path, redis: Any | None = None
+    ):
+        self.store = open_namespace(
+            "covers",
+            RAW,
+            backend=config.backend,
+            data_dir=data_dir,
+            redis=redis,
+            max_mb=config.max_mb,
+            by_bytes=True,
+        )
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    @staticmethod
+    def make_key(url: str, size: tuple[int, int]) -> str:
+        return f"{size[0]}x{size[1]}|{url}"
+
+    async def peek(self, url: str, size: tuple[int, int]) -> Image.Image | None:
+        """只读缓存中的缩略图，未命中时不下载"""
+        if data := await self.store.get(self.make_key(url, size)):
+            return await asyncio.to_thread(_decode, data)
+        return None
+
+    async def get(
+        self,
+        url: str,
+        size: tuple[int, int],
+        fetch: Callable[[str], Awaitable[bytes | None]],
+    ) -> Image.Image | None:
+        """
+        获取缩略图，未命中时用 fetch 下载原图并写入缓存
+        解码和缩放都放在线程里执行，不阻塞事件循环
+        """
+        if (thumb := await self.peek(url, size)) is not None:
+            return thumb
+
+        key = self.make_key(url, size)
+        raw = await fetch(url)
+        if not raw:
+            return None
+        thumb = await asyncio.to_thread(make_thumbnail, raw, size)
+        await self.store.set(key, await asyncio.to_thread(_encode, thumb))
+        return thumb
@@ -0,0 +1,61 @@
+import time
+from pathlib import Path
+from typing import Any
+
+from ..config import CZCacheConfig
+from .enrichment import estimate_url_expiry
+from .namespace import open_namespace
+from .serde import JSON
+
+# 签名卡片在到期前这么多秒就不再复用，留出发送耗时
+_ARK_MARGIN = 60
+
+
+class CZCardCache:
+    """
+    CZ 签名卡片与封面真实地址的缓存
+    卡片按 (卡片格式, 歌曲ID, 音频链接) 缓存，有效期不超过卡片签发时间和音频链接的过期时间；
+    封面地址按原始链接缓存重定向后的结果
+    """
+
+    def __init__(
+        self, config: CZCacheConfig, data_dir: Path, redis: Any | None = None
+    ):
+        self.cfg = config
+        options = {
+            "backend": config.backend,
+            "data_dir": data_dir,
+            "max_entries": config.max_entries,
+            "max_mb": config.max_mb,
+            "redis": redis,
+        }
+        self.arks = open_namespace("cz_arks", JSON, **options)
+        self.covers = open_namespace(
+            "cz_covers", JSON, ttl=config.cover_ttl, **options
+        )
+
+    @staticmethod
+    def make_key(card_format: str, song_id: str | int, audio_url: str) -> str:
+        return f"{card_format}:{song_id}|{audio_url}"
+
+    async def get_ark(self, key: str) -> dict[str, Any] | None:
+        return await self.arks.get(key)
+
+    async def put_ark(self, key: str, ark: dict[str, Any], audio_url: str) -> None:
+        now = time.time()
+        expires = min(
+            now + self.cfg.ark_ttl,
+            estimate_url_expiry(audio_url, self.cfg.ark_ttl),
+        )
+        ctime = (ark.get("config") or {}).get("ctime")
+        if isinstance(ctime, int | float) and ctime > 0:
+            expires = min(expires, ctime + self.cfg.ark_ttl)
+        ttl = expires - now - _ARK_MARGIN
+        if ttl > 0:
+            await self.arks.set(key, ark, ttl=ttl)
+
+    async def get_cover(self, url: str) -> str | None:
+        return await self.covers.get(url)
+
+    async def put_cover(self, url: str, resolved: str) -> None:
+        await self.covers.set(url, resolved)
@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+import os
+import struct
+import time
+from pathlib import Path
+
+from astrbot.api import logger
+
+from .backend import CacheBackend
+from .stats import CacheStats
+
+# 文件头：过期时间（Unix 时间戳，0 表示不过期）
+_HEADER = struct.Struct(">d")
+
+
+class DiskStore(CacheBackend):
+    """
+    分片目录形式的磁盘键值存储
+    文件名为键的摘要，按前两位分到子目录；总大小超出预算时按最近访问时间淘汰
+    """
+
+    def __init__(self, root: Path, max_bytes: int, ttl: float | None = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._size: int | None = None
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / digest
+
+    @staticmethod
+    def _size_of(path: Path) -> int | None:
+        """已有文件的大小，不存在时为 None"""
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def _account(self, entries: int, size: int) -> None:
+        # 首次写入前还没统计过目录，留给 _prune 一并统计
+        if self._size is None:
+            return
+        self._size += size
+        self.stats.entries += entries
+        self.stats.weight = self.stats.bytes = self._size
+
+    def _unlink(self, path: Path) -> None:
+        old = self._size_of(path)
+        if old is None:
+            return
+        path.unlink(missing_ok=True)
+        self._account(-1, -old)
+
+    def _read(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        if len(data) < _HEADER.size:
+            self._unlink(path)
+            return None
+        (expires_at,) = _HEADER.unpack_from(data)
+        if expires_at and expires_at <= time.time():
+            self._unlink(path)
+            return None
+        # 用 mtime 记录最近访问时间，供淘汰使用
+        os.utime(path, None)
+        return data[_HEADER.size :]
+
+    def _write(self, key: str, value: bytes, ttl: float | None) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        expires_at = time.time() + ttl if ttl is not None else 0.0
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(_HEADER.pack(expires_at) + value)
+        old = self._size_of(path)
+        tmp.replace(path)
+        size = _HEADER.size + len(value)
+        if old is None:
+            self._account(1, size)
+        else:
+            self._account(0, size - old)
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        files = []
+        for path in self.root.glob("*/*"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def _prune(self) -> None:
+        files = self._scan()
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes * 0.9:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        self._size = total
+        self.stats.evictions += removed
+        self.stats.weight = self.stats.bytes = total
+        self.stats.entries = len(files) - removed
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            data = await asyncio.to_thread(self._read, key)
+        except OSError as e:
+            logger.warning(f"读取磁盘缓存失败: {e}")
+            data = None
+        if data is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return data
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            await asyncio.to_thread(self._write, key, value, ttl)
+        except OSError as e:
+            logger.warning(f"写入磁盘缓存失败: {e}")
+            return
+        if self._size is None:
+            # 首次写入时统计一次目录现有大小
+            await asyncio.to_thread(self._prune)
+            return
+        if self._size > self.max_bytes:
+            await asyncio.to_thread(self._prune)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(self._unlink, self._path(key))
+        except OSError as e:
+            logger.warning(f"删除磁盘缓存失败: {e}")
@@ -0,0 +1,137 @@
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from ..config import EnrichmentCacheConfig
+from ..model import Song
+from .namespace import open_namespace
+from .serde import Codec, pack, unpack
+
+_CST = timezone(timedelta(hours=8))
+# 网易云 CDN：http://m701.music.126.net/20240101123456/<签名>/... 第一段即过期时间
+_NETEASE_STAMP = re.compile(r"^/(\d{14})/")
+_EXPIRY_PARAMS = ("expires", "expire", "e", "x-expires", "x-oss-expires")
+
+
+def estimate_url_expiry(url: str, default_ttl: float) -> float:
+    """
+    推算签名音频链接的过期时间（Unix 时间戳）
+    能从链接中解析出过期时间时以其为准，否则按 default_ttl 估算
+    """
+    now = time.time()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return now + default_ttl
+
+    if match := _NETEASE_STAMP.match(parts.path):
+        try:
+            stamp = datetime.strptime(match.group(1), "%Y%m%d%H%M%S")
+            return stamp.replace(tzinfo=_CST).timestamp()
+        except ValueError:
+            pass
+
+    query = {k.lower(): v[0] for k, v in parse_qs(parts.query).items() if v}
+    for name in _EXPIRY_PARAMS:
+        value = query.get(name, "")
+        if value.isdigit() and now - 86400 < int(value) < now + 86400 * 30:
+            return float(value)
+    if (amz := query.get("x-amz-expires", "")).isdigit() and (
+        date := query.get("x-amz-date")
+    ):
+        try:
+            signed = datetime.strptime(date, "%Y%m%dT%H%M%SZ")
+            return signed.replace(tzinfo=timezone.utc).timestamp() + int(amz)
+        except ValueError:
+            pass
+    return now + default_ttl
+
+
+@dataclass(slots=True)
+class Enrichment:
+    """fetch_extra 的结果"""
+
+    audio_url: str | None = None
+    cover_url: str | None = None
+    lyrics: str | None = None
+    audio_expires: float = 0.0
+    """ 音频链接过期时间（Unix 时间戳） """
+
+    @property
+    def playable(self) -> bool:
+        return bool(self.audio_url)
+
+    def apply(self, song: Song, with_audio: bool = True) -> Song:
+        """把缓存的字段补到 song 的空字段上"""
+        if with_audio and self.audio_url and not song.audio_url:
+            song.audio_url = self.audio_url
+        if self.cover_url and not song.cover_url:
+            song.cover_url = self.cover_url
+        if self.lyrics and not song.lyrics:
+            song.lyrics = self.lyrics
+        return song
+
+
+ENRICHMENT = Codec(
+    dumps=lambda e: pack([e.audio_url, e.cover_url, e.lyrics, e.audio_expires]),
+    loads=lambda data: Enrichment(*unpack(data)),
+)
+""" Enrichment 按字段顺序编码成数组 """
+
+
+class EnrichmentCache:
+    """
+    按 (来源, 歌曲ID) 缓存音频链接、封面和歌词
+    - 签名音频链接按解析/估算出的过期时间提前失效，届时只重新获取音频
+    - 没有可播放链接的歌曲（如 VIP 歌曲）也会记住一段时间，不再反复请求
+    """
+
+    def __init__(
+        self, config: EnrichmentCacheConfig, data_dir: Path, redis: Any | None = None
+    ):
+        self.cfg = config
+        self.store = open_namespace(
+            "enrichment",
+            ENRICHMENT,
+            backend=config.backend,
+            data_dir=data_dir,
+            redis=redis,
+            max_entries=config.max_entries,
+            max_mb=config.max_mb,
+            ttl=config.ttl,
+        )
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    @staticmethod
+    def make_key(source: str, song_id: str | int) -> str:
+        return f"{source}:{song_id}"
+
+    async def get(self, key: str) -> Enrichment | None:
+        return await self.store.get(key)
+
+    def audio_fresh(self, entry: Enrichment) -> bool:
+        """音频链接距离过期还有足够余量"""
+        return entry.audio_expires - self.cfg.refresh_margin > time.time()
+
+    async def put(self, key: str, song: Song) -> Enrichment:
+        entry = Enrichment(
+            audio_url=song.audio_url,
+            cover_url=song.cover_url,
+            lyrics=song.lyrics,
+        )
+        if entry.playable:
+            entry.audio_expires = estimate_url_expiry(
+                entry.audio_url,  # type: ignore[arg-type]
+                self.cfg.audio_ttl,
+            )
+            await self.store.set(key, entry)
+        else:
+            await self.store.set(key, entry, ttl=self.cfg.negative_ttl)
+        return entry
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from pathlib import Path
+
+from astrbot.api import logger
+
+from ..config import PluginConfig
+from .backend import MemoryBackend
+from .comments import CommentCache
+from .cover import CoverCache
+from .cz import CZCardCache
+from .enrichment import EnrichmentCache
+from .lyrics import LyricsStore
+from .lyrics_images import LyricsImageCache
+from .media import MediaHandleCache
+from .memory import TTLCache
+from .namespace import CacheNamespace
+from .remote import close_redis, connect_redis
+from .search import SearchCache
+from .selection_images import SelectionImageCache
+from .serde import RAW, Codec
+from .snapshot import read_snapshot, write_snapshot
+from .songs import SongStore
+from .stats import CacheStats
+from .tiles import TILE, TileCache
+
+
+class CacheHub:
+    """插件内各类缓存的集合，按命名空间统计命中情况"""
+
+    def __init__(self, config: PluginConfig):
+        self.cfg = config
+        # 多节点共享的 Redis 客户端，未配置时为 None
+        self.redis = connect_redis(config.redis_url)
+        cache, data_dir, redis = config.cache, config.data_dir, self.redis
+        self.search = SearchCache(cache.search, data_dir, redis)
+        self.enrichment = EnrichmentCache(cache.enrichment, data_dir, redis)
+        self.songs = SongStore(cache)
+        self.lyrics = LyricsStore(cache.lyrics, data_dir, redis)
+        self.comments = CommentCache(cache.comments, data_dir, redis)
+        self.covers = CoverCache(cache.covers, data_dir, redis)
+        self.tiles = TileCache(cache.tiles)
+        self.lyric_images = LyricsImageCache(config)
+        self.selection_images = SelectionImageCache(
+            cache.selection_images, data_dir, redis
+        )
+        self.cz = CZCardCache(cache.cz, data_dir, redis)
+        self.media = MediaHandleCache(cache.media, data_dir, redis)
+
+    def namespaces(self) -> list[CacheNamespace]:
+        """可切换后端的命名空间"""
+        return [
+            self.search.store,
+            self.enrichment.store,
+            self.lyrics.store,
+            self.comments.store,
+            self.covers.store,
+            self.cz.arks,
+            self.cz.covers,
+            self.selection_images.store,
+            self.media.store,
+        ]
+
+    def stats(self) -> dict[str, CacheStats]:
+        stats = {ns.name: ns.stats for ns in self.namespaces()}
+        stats["songs"] = self.songs.stats
+        stats["tiles"] = self.tiles.stats
+        stats["lyric_images"] = self.lyric_images.stats
+        if self.lyric_images.disk is not None:
+            stats["lyric_images_disk"] = self.lyric_images.disk.stats
+        return stats
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.cfg.data_dir / "cache_snapshot.bin"
+
+    def _snapshot_targets(self) -> dict[str, tuple[TTLCache, Codec]]:
+        """只保存在进程内存里的缓存；持久化或共享后端本身就能跨重载保留"""
+        targets = {
+            ns.name: (ns.backend.store, ns.codec)
+            for ns in self.namespaces()
+            if isinstance(ns.backend, MemoryBackend)
+        }
+        targets["tiles"] = (self.tiles.store, TILE)
+        targets["lyric_images"] = (self.lyric_images.memory.store, RAW)
+        return targets
+
+    async def save_snapshot(self) -> None:
+        """把内存中的热缓存写入快照，供插件重载后恢复"""
+        now = time.time()
+        items = [
+            (name, codec, store.items())
+            for name, (store, codec) in self._snapshot_targets().items()
+        ]
+
+        def entries():
+            for name, codec, rows in items:
+                for key, value, ttl in rows:
+                    expires_at = now + ttl if ttl is not None else 0.0
+                    yield name, str(key), codec.dumps(value), expires_at
+
+        try:
+            count = await asyncio.to_thread(
+                write_snapshot, self.snapshot_path, entries()
+            )
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"保存缓存快照失败: {e}")
+            return
+        logger.debug(f"已保存缓存快照：{count} 条")
+
+    async def load_snapshot(self) -> None:
+        """
+        在后台恢复快照，不阻塞插件启动
+        启动后已经写入的新条目优先，不会被快照覆盖
+        """
+        targets = self._snapshot_targets()
+
+        def decode() -> list[tuple[str, str, object, float]]:
+            decoded = []
+            for name, key, value, expires_at in read_snapshot(self.snapshot_path):
+                if name not in targets:
+                    continue
+                try:
+                    decoded.append(
+                        (name, key, targets[name][1].loads(value), expires_at)
+                    )
+                except (ValueError, TypeError):
+                    continue
+            return decoded
+
+        try:
+            entries = await asyncio.to_thread(decode)
+        except OSError as e:
+            logger.warning(f"读取缓存快照失败: {e}")
+            return
+        now = time.time()
+        restored = 0
+        for name, key, value, expires_at in entries:
+            store = targets[name][0]
+            if key in store:
+                continue
+            ttl = expires_at - now if expires_at else None
+            if ttl is not None and ttl <= 0:
+                continue
+            store.set(key, value, ttl=ttl)
+            restored += 1
+        logger.debug(f"已恢复缓存快照：{restored} 条")
+
+    async def close(self) -> None:
+        for ns in self.namespaces():
+            await ns.close()
+        if self.redis is not None:
+            await close_redis(self.redis)
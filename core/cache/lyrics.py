@@ -0,0 +1,44 @@
+from pathlib import Path
+from typing import Any
+
+from ..config import LyricsCacheConfig
+from .namespace import open_namespace
+from .serde import TEXT
+
+
+class LyricsStore:
+    """
+    歌词持久化缓存
+    歌词不会变，按 (来源, 歌曲ID) 压缩后保存（默认存进插件数据目录下的 SQLite 文件），
+    先于任何网络请求读取
+    """
+
+    def __init__(
+        self, config: LyricsCacheConfig, data_dir: Path, redis: Any | None = None
+    ):
+        self.store = open_namespace(
+            "lyrics",
+            TEXT,
+            backend=config.backend,
+            data_dir=data_dir,
+            redis=redis,
+            max_entries=config.max_entries,
+            max_mb=config.max_mb,
+        )
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    @staticmethod
+    def make_key(source: str, song_id: str | int) -> str:
+        return f"{source}:{song_id}"
+
+    async def get(self, key: str) -> str | None:
+        return await self.store.get(key)
+
+    async def put(self, key: str, lyrics: str) -> None:
+        await self.store.set(key, lyrics)
+
+    async def close(self) -> None:
+        await self.store.close()
@@ -0,0 +1,47 @@
+import hashlib
+
+from ..config import PluginConfig
+from .backend import MemoryBackend
+from .disk import DiskStore
+
+
+class LyricsImageCache:
+    """
+    歌词图片缓存
+    按 (清洗后的歌词, 主题参数, 输出格式) 的摘要保存编码好的图片，
+    内存层按字节数限额，可选磁盘层在重启后继续命中
+    """
+
+    def __init__(self, config: PluginConfig):
+        cfg = config.cache.lyric_images
+        self.memory = MemoryBackend(cfg.memory_mb * 1024 * 1024, weigher=len)
+        self.disk = (
+            DiskStore(
+                config.data_dir / "cache" / "lyric_images", cfg.disk_mb * 1024 * 1024
+            )
+            if cfg.disk_mb > 0
+            else None
+        )
+
+    @property
+    def stats(self):
+        return self.memory.stats
+
+    @staticmethod
+    def make_key(*parts: object) -> str:
+        return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> bytes | None:
+        if (data := await self.memory.get(key)) is not None:
+            return data
+        if self.disk is None:
+            return None
+        data = await self.disk.get(key)
+        if data is not None:
+            await self.memory.set(key, data)
+        return data
+
+    async def put(self, key: str, data: bytes) -> None:
+        await self.memory.set(key, data)
+        if self.disk is not None:
+            await self.disk.set(key, data)
@@ -0,0 +1,68 @@
+import hashlib
+from pathlib import Path
+from typing import Any
+
+from ..config import MediaCacheConfig
+from .namespace import open_namespace
+from .serde import JSON
+
+
+class MediaHandleCache:
+    """
+    已上传媒体的平台句柄缓存
+    按 (适配器, 作用域, 媒体类型, 内容摘要) 保存平台返回的可复用引用，
+    如 OneBot 消息里的图片链接、QQ 官方接口上传后的 file_info，
+    同一份内容再次发送时直接引用，不再重新上传
+    """
+
+    def __init__(
+        self, config: MediaCacheConfig, data_dir: Path, redis: Any | None = None
+    ):
+        self.cfg = config
+        self.store = open_namespace(
+            "media",
+            JSON,
+            backend=config.backend,
+            data_dir=data_dir,
+            redis=redis,
+            max_entries=config.max_entries,
+            max_mb=config.max_mb,
+            ttl=config.ttl,
+        )
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha1(data).hexdigest()
+
+    @staticmethod
+    def file_digest(path: Path) -> str:
+        """分块计算文件摘要，音频文件较大，调用方应放到线程里执行"""
+        h = hashlib.sha1()
+        with path.open("rb") as f:
+            while chunk := f.read(1024 * 1024):
+                h.update(chunk)
+        return h.hexdigest()
+
+    @staticmethod
+    def make_key(adapter: str, scope: str, kind: str, digest: str) -> str:
+        return f"{adapter}|{scope}|{kind}|{digest}"
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return await self.store.get(key)
+
+    async def put(
+        self, key: str, handle: dict[str, Any], ttl: float | None = None
+    ) -> None:
+        """
+        :param ttl: 平台给出的有效期（秒），不超过配置的有效期
+        """
+        if ttl is not None and self.cfg.ttl:
+            ttl = min(ttl, self.cfg.ttl)
+        await self.store.set(key, handle, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.store.delete(key)
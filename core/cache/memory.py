@@ -0,0 +1,98 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from .stats import CacheStats
+
+MISSING: Any = object()
+""" 缓存未命中的哨兵值，用来区分缓存了 None 的情况 """
+
+
+class TTLCache:
+    """In-process LRU cache with per-entry TTL and a weight budget.
+
+    Entries expire after their TTL and the least recently used ones are
+    evicted once the total weight exceeds ``max_weight``. By default every
+    entry weighs 1, so the budget is an entry count; pass ``weigher`` to
+    budget by bytes, pixels or anything else.
+    """
+
+    def __init__(
+        self,
+        max_weight: int,
+        ttl: float | None = None,
+        weigher: Callable[[Any], int] | None = None,
+    ):
+        self.max_weight = max_weight
+        self.ttl = ttl
+        self.weigher = weigher
+        self.stats = CacheStats()
+        self._data: OrderedDict[Hashable, tuple[Any, float | None, int]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, count=False) is not MISSING
+
+    def get(self, key: Hashable, default: Any = MISSING, count: bool = True) -> Any:
+        item = self._data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.monotonic():
+            self._remove(key)
+            item = None
+        if item is None:
+            if count:
+                self.stats.misses += 1
+            return default
+        self._data.move_to_end(key)
+        if count:
+            self.stats.hits += 1
+        return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = MISSING) -> None:
+        ttl = self.ttl if ttl is MISSING else ttl
+        weight = self.weigher(value) if self.weigher else 1
+        if weight > self.max_weight:
+            return
+        if key in self._data:
+            self._remove(key)
+        expires = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires, weight)
+        self.stats.weight += weight
+        self.stats.entries = len(self._data)
+        self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        self._remove(key)
+        return item[0]
+
+    def items(self) -> list[tuple[Hashable, Any, float | None]]:
+        """按从旧到新的顺序列出未过期的条目及其剩余有效期（秒，None 表示不过期）"""
+        now = time.monotonic()
+        return [
+            (key, value, expires - now if expires is not None else None)
+            for key, (value, expires, _) in list(self._data.items())
+            if expires is None or expires > now
+        ]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.stats.weight = 0
+        self.stats.entries = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, weight = self._data.pop(key)
+        self.stats.weight -= weight
+        self.stats.entries = len(self._data)
+
+    def _evict(self) -> None:
+        while self.stats.weight > self.max_weight and self._data:
+            key = next(iter(self._data))
+            self._remove(key)
+            self.stats.evictions += 1
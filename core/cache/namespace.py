@@ -0,0 +1,96 @@
+from contextlib import AbstractAsyncContextManager
+from pathlib import Path
+from typing import Any
+
+from astrbot.api import logger
+
+from .backend import CacheBackend, MemoryBackend
+from .disk import DiskStore
+from .remote import RedisBackend
+from .serde import Codec
+from .sqlite import SqliteStore
+from .stats import CacheStats
+
+BACKENDS = ("memory", "sqlite", "disk", "redis")
+""" 可选的缓存后端 """
+
+
+class CacheNamespace:
+    """
+    一个缓存命名空间：后端 + 编解码器
+    后端需要 bytes 时才做序列化，内存后端直接存取对象
+    """
+
+    def __init__(self, name: str, backend: CacheBackend, codec: Codec):
+        self.name = name
+        self.backend = backend
+        self.codec = codec
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.backend.stats
+
+    async def get(self, key: str) -> Any | None:
+        value = await self.backend.get(key)
+        if value is None or not self.backend.persistent:
+            return value
+        try:
+            return self.codec.loads(value)
+        except (ValueError, TypeError):
+            # 格式版本不兼容或数据损坏，当作未命中
+            await self.backend.delete(key)
+            return None
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        if self.backend.persistent:
+            value = self.codec.dumps(value)
+        await self.backend.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.backend.delete(key)
+
+    def lock(self, key: str) -> AbstractAsyncContextManager[bool]:
+        """见 CacheBackend.lock"""
+        return self.backend.lock(key)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def open_namespace(
+    name: str,
+    codec: Codec,
+    *,
+    backend: str,
+    data_dir: Path,
+    max_entries: int = 0,
+    max_mb: int = 0,
+    ttl: float | None = None,
+    by_bytes: bool = False,
+    redis: Any | None = None,
+) -> CacheNamespace:
+    """
+    按配置创建命名空间
+    :param backend: memory / sqlite / disk / redis，未知值按 memory 处理
+    :param max_entries: 内存后端的条目上限
+    :param max_mb: 持久化后端（以及 by_bytes 的内存后端）的容量上限
+    :param by_bytes: 值本身就是 bytes，内存后端也按字节数限额
+    :param redis: Redis 客户端，未连接时 redis 后端退回内存后端
+    """
+    if backend == "redis" and redis is None:
+        logger.warning(f"缓存 {name} 配置了 redis 后端但未连接 Redis，改用内存缓存")
+        backend = "memory"
+    max_bytes = max_mb * 1024 * 1024
+    if backend == "redis":
+        store: CacheBackend = RedisBackend(redis, name, ttl=ttl)
+    elif backend == "sqlite":
+        store = SqliteStore(
+            data_dir / f"{name}.db", name, max_bytes=max_bytes, ttl=ttl
+        )
+    elif backend == "disk":
+        store = DiskStore(data_dir / "cache" / name, max_bytes, ttl=ttl)
+    elif by_bytes:
+        store = MemoryBackend(max_bytes, ttl=ttl, weigher=len)
+    else:
+        store = MemoryBackend(max_entries, ttl=ttl)
+    return CacheNamespace(name, store, codec)
@@ -0,0 +1,128 @@
+import asyncio
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from astrbot.api import logger
+
+from .backend import CacheBackend
+from .stats import CacheStats
+
+try:  # 可选依赖：多节点部署时才需要 redis
+    from redis import asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover - 取决于运行环境
+    aioredis = None
+    RedisError = OSError
+
+KEY_PREFIX = "astrbot_music:"
+""" 插件在 Redis 中所有键的前缀 """
+
+# 只删除自己持有的锁：值与令牌一致时才删除
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def connect_redis(url: str) -> Any | None:
+    """
+    按 URL 创建 Redis 客户端（兼容 Redis 协议的服务均可）
+    未配置 URL 或未安装 redis 包时返回 None，调用方退回进程内模式
+    """
+    if not url:
+        return None
+    if aioredis is None:
+        logger.warning("已配置 redis_url 但未安装 redis 包，共享缓存与选歌状态将只保存在本进程")
+        return None
+    return aioredis.from_url(url)
+
+
+async def close_redis(client: Any) -> None:
+    close = getattr(client, "aclose", None) or client.close
+    try:
+        await close()
+    except RedisError as e:
+        logger.warning(f"关闭 Redis 连接失败: {e}")
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis 协议的共享缓存后端
+    多个节点共用同一份缓存；淘汰交给服务端的 maxmemory 策略，本地只统计命中
+    """
+
+    LOCK_TTL = 15.0
+    """ 分布式锁的最长持有时间（秒），持有者异常退出时锁也会自动释放 """
+
+    LOCK_POLL = 0.1
+
+    def __init__(self, client: Any, namespace: str, ttl: float | None = None):
+        self.client = client
+        self.prefix = f"{KEY_PREFIX}{namespace}:"
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            value = await self.client.get(self.prefix + key)
+        except RedisError as e:
+            logger.warning(f"读取 Redis 缓存失败: {e}")
+            value = None
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            await self.client.set(
+                self.prefix + key, value, px=int(ttl * 1000) if ttl else None
+            )
+        except RedisError as e:
+            logger.warning(f"写入 Redis 缓存失败: {e}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.delete(self.prefix + key)
+        except RedisError as e:
+            logger.warning(f"删除 Redis 缓存失败: {e}")
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[bool]:
+        """
+        跨节点的单飞锁
+        拿不到锁时等待持有者释放（或超时），yield 是否等待过，
+        等待过的调用方应先重新读缓存
+        """
+        name = f"{self.prefix}lock:{key}"
+        token = uuid.uuid4().hex
+        waited = False
+        acquired = False
+        deadline = asyncio.get_running_loop().time() + self.LOCK_TTL
+        try:
+            while True:
+                acquired = bool(
+                    await self.client.set(
+                        name, token, nx=True, px=int(self.LOCK_TTL * 1000)
+                    )
+                )
+                if acquired or asyncio.get_running_loop().time() >= deadline:
+                    break
+                waited = True
+                await asyncio.sleep(self.LOCK_POLL)
+        except RedisError as e:
+            logger.warning(f"获取 Redis 锁失败: {e}")
+        try:
+            yield waited
+        finally:
+            if acquired:
+                try:
+                    await self.client.eval(_RELEASE_SCRIPT, 1, name, token)
+                except RedisError as e:
+                    logger.warning(f"释放 Redis 锁失败: {e}")
@@ -0,0 +1,50 @@
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from ..config import SearchCacheConfig
+from ..model import Song
+from ..utils import normalize_keyword
+from .namespace import open_namespace
+from .serde import SONGS
+
+
+class SearchCache:
+    """
+    搜索结果缓存
+    键为 (播放器, 子平台, 规范化关键词, 数量)，空结果也会短暂缓存，
+    避免反复搜索不存在的歌曲时一直请求上游
+    """
+
+    def __init__(
+        self, config: SearchCacheConfig, data_dir: Path, redis: Any | None = None
+    ):
+        self.cfg = config
+        self.store = open_namespace(
+            "search",
+            SONGS,
+            backend=config.backend,
+            data_dir=data_dir,
+            redis=redis,
+            max_entries=config.max_entries,
+            max_mb=config.max_mb,
+            ttl=config.ttl,
+        )
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    @staticmethod
+    def make_key(player: str, scope: str, keyword: str, limit: int) -> str:
+        return f"{player}|{scope}|{limit}|{normalize_keyword(keyword)}"
+
+    async def get(self, key: str) -> list[Song] | None:
+        songs = await self.store.get(key)
+        if songs is None:
+            return None
+        return [replace(s) for s in songs]
+
+    async def put(self, key: str, songs: list[Song]) -> None:
+        ttl = self.cfg.ttl if songs else self.cfg.negative_ttl
+        await self.store.set(key, [replace(s) for s in songs], ttl=ttl)
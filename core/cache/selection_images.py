@@ -0,0 +1,46 @@
+import hashlib
+from pathlib import Path
+from typing import Any
+
+from ..config import SelectionImageCacheConfig
+from .namespace import open_namespace
+from .serde import RAW
+
+
+class SelectionImageCache:
+    """
+    选歌图片缓存
+    按结果集指纹（歌曲顺序与展示字段、每行卡片数、卡片主题）保存编码好的 JPEG，
+    热门搜索再次出现时无需补全、下载封面和渲染
+    """
+
+    def __init__(
+        self,
+        config: SelectionImageCacheConfig,
+        data_dir: Path,
+        redis: Any | None = None,
+    ):
+        self.store = open_namespace(
+            "selection_images",
+            RAW,
+            backend=config.backend,
+            data_dir=data_dir,
+            redis=redis,
+            max_mb=config.max_mb,
+            ttl=config.ttl,
+            by_bytes=True,
+        )
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    @staticmethod
+    def make_key(fingerprint: tuple) -> str:
+        return hashlib.sha1(repr(fingerprint).encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.store.get(key)
+
+    async def put(self, key: str, image: bytes) -> None:
+        await self.store.set(key, image)
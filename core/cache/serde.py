@@ -0,0 +1,104 @@
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass, fields
+from typing import Any
+
+from ..model import Comment, Song
+from ..net import json_dumps, json_loads
+
+_PLAIN = 1
+_DEFLATE = 2
+# 小于该长度的数据压缩后往往反而更大
+_COMPRESS_MIN = 256
+
+_SONG_FIELDS = tuple(f.name for f in fields(Song))
+
+
+def pack(obj: Any) -> bytes:
+    """
+    把由基本类型组成的对象编码成紧凑的二进制
+    格式：1 字节格式版本 + JSON（较长时用 zlib 压缩）
+    """
+    data = json_dumps(obj)
+    if len(data) >= _COMPRESS_MIN:
+        return bytes((_DEFLATE,)) + zlib.compress(data)
+    return bytes((_PLAIN,)) + data
+
+
+def unpack(data: bytes) -> Any:
+    """pack 的逆操作，遇到未知版本或损坏数据时抛出 ValueError"""
+    if not data:
+        raise ValueError("empty cache record")
+    version, body = data[0], data[1:]
+    if version == _DEFLATE:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise ValueError(str(e)) from e
+    elif version != _PLAIN:
+        raise ValueError(f"unknown cache record version: {version}")
+    return json_loads(body)
+
+
+def song_to_record(song: Song) -> list:
+    """Song 按字段顺序转成数组，评论转成 [内容, 点赞数]"""
+    record = [getattr(song, name) for name in _SONG_FIELDS]
+    if song.comments:
+        record[_SONG_FIELDS.index("comments")] = comments_to_record(song.comments)
+    return record
+
+
+def song_from_record(record: list) -> Song:
+    song = Song(**dict(zip(_SONG_FIELDS, record)))
+    if song.comments:
+        song.comments = comments_from_record(song.comments)  # type: ignore[arg-type]
+    return song
+
+
+def comments_to_record(comments: list[Comment]) -> list:
+    return [[c.content, c.liked_count] for c in comments]
+
+
+def comments_from_record(record: list) -> list[Comment]:
+    return [Comment(content, liked_count) for content, liked_count in record]
+
+
+def _compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"))
+
+
+def _decompress_text(data: bytes) -> str:
+    try:
+        return zlib.decompress(data).decode("utf-8")
+    except zlib.error as e:
+        raise ValueError(str(e)) from e
+
+
+@dataclass(slots=True, frozen=True)
+class Codec:
+    """缓存值与 bytes 之间的编解码器"""
+
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+RAW = Codec(dumps=bytes, loads=bytes)
+""" 值本身就是 bytes """
+
+JSON = Codec(dumps=pack, loads=unpack)
+""" 由基本类型组成的值 """
+
+TEXT = Codec(dumps=_compress_text, loads=_decompress_text)
+""" 长文本（如歌词），压缩保存 """
+
+SONGS = Codec(
+    dumps=lambda songs: pack([song_to_record(s) for s in songs]),
+    loads=lambda data: [song_from_record(r) for r in unpack(data)],
+)
+""" 歌曲列表 """
+
+COMMENTS = Codec(
+    dumps=lambda comments: pack(comments_to_record(comments)),
+    loads=lambda data: comments_from_record(unpack(data)),
+)
+""" 精简评论列表 """
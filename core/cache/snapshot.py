@@ -0,0 +1,78 @@
+import struct
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+
+MAGIC = b"AMCS"
+""" 快照文件标识 """
+
+VERSION = 1
+""" 快照格式版本，格式变化时递增，旧快照直接忽略 """
+
+# 每条记录：命名空间名长度、键长度、过期时间（Unix 时间戳，0 表示不过期）、值长度
+_RECORD = struct.Struct(">HIdI")
+_PREAMBLE = MAGIC + bytes((VERSION,))
+
+SnapshotEntry = tuple[str, str, bytes, float]
+""" (命名空间, 键, 编码后的值, 过期时间) """
+
+
+def write_snapshot(path: Path, entries: Iterator[SnapshotEntry]) -> int:
+    """
+    把缓存条目流式压缩写入快照文件，先写临时文件再替换，返回写入的条目数
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    count = 0
+    compressor = zlib.compressobj(6)
+    with tmp.open("wb") as f:
+        f.write(_PREAMBLE)
+        for name, key, value, expires_at in entries:
+            name_bytes = name.encode("utf-8")
+            key_bytes = key.encode("utf-8")
+            record = _RECORD.pack(
+                len(name_bytes), len(key_bytes), expires_at, len(value)
+            )
+            f.write(compressor.compress(record + name_bytes + key_bytes + value))
+            count += 1
+        f.write(compressor.flush())
+    tmp.replace(path)
+    return count
+
+
+def read_snapshot(path: Path) -> list[SnapshotEntry]:
+    """
+    读取快照中仍未过期的条目
+    文件不存在、版本不符或已损坏时返回空列表
+    """
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return []
+    if not raw.startswith(_PREAMBLE):
+        return []
+    try:
+        data = zlib.decompress(raw[len(_PREAMBLE) :])
+    except zlib.error:
+        return []
+
+    now = time.time()
+    entries: list[SnapshotEntry] = []
+    offset = 0
+    while offset + _RECORD.size <= len(data):
+        name_len, key_len, expires_at, value_len = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        end = offset + name_len + key_len + value_len
+        if end > len(data):
+            break
+        name = data[offset : offset + name_len].decode("utf-8")
+        offset += name_len
+        key = data[offset : offset + key_len].decode("utf-8")
+        offset += key_len
+        value = data[offset:end]
+        offset = end
+        if expires_at and expires_at <= now:
+            continue
+        entries.append((name, key, value, expires_at))
+    return entries
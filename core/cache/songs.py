@@ -0,0 +1,99 @@
+import time
+from dataclasses import dataclass, field, fields
+
+from ..config import CacheConfig
+from ..model import Song
+from ..utils import is_url
+from .enrichment import estimate_url_expiry
+from .memory import MISSING, TTLCache
+
+# id/source 是身份本身，path 是本地下载路径，都不参与合并
+_MERGED_FIELDS = tuple(
+    f.name for f in fields(Song) if f.name not in ("id", "source", "path")
+)
+
+
+@dataclass(slots=True)
+class SongRecord:
+    """一首歌的规范记录"""
+
+    song: Song
+    fresh_until: dict[str, float] = field(default_factory=dict)
+    """ 各字段的有效期（Unix 时间戳） """
+
+    def fresh_fields(self, now: float) -> list[str]:
+        return [name for name, until in self.fresh_until.items() if until > now]
+
+
+class SongStore:
+    """
+    歌曲身份映射
+    按 (来源, 歌曲ID) 保存每首歌目前已知的全部字段，字段各自记录有效期：
+    签名音频链接按其过期时间，热评按热评缓存的有效期，其余字段按 songs.ttl。
+    搜索结果与之对账后，后续请求拿到的就是已补全的歌曲
+    """
+
+    def __init__(self, config: CacheConfig):
+        self.cfg = config
+        self.store = TTLCache(
+            max_weight=config.songs.max_entries, ttl=config.songs.ttl
+        )
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    @staticmethod
+    def make_key(source: str, song_id: str | int) -> str:
+        return f"{source}:{song_id}"
+
+    def _fresh_until(self, name: str, value, now: float) -> float:
+        if name == "audio_url":
+            enrichment = self.cfg.enrichment
+            expires = estimate_url_expiry(value, enrichment.audio_ttl)
+            return expires - enrichment.refresh_margin
+        if name == "comments":
+            return now + self.cfg.comments.ttl
+        return now + self.cfg.songs.ttl
+
+    def get(self, source: str, song_id: str | int) -> SongRecord | None:
+        record = self.store.get(self.make_key(source, song_id))
+        return None if record is MISSING else record
+
+    def learn(
+        self, source: str, song: Song, names: tuple[str, ...] = _MERGED_FIELDS
+    ) -> None:
+        """
+        把 song 上已有的字段合并进规范记录，并刷新这些字段的有效期
+        :param names: 只合并这些字段，默认全部
+        """
+        source = song.source or source
+        key = self.make_key(source, song.id)
+        record = self.store.get(key, count=False)
+        if record is MISSING:
+            record = SongRecord(Song(id=song.id, source=source))
+            self.store.set(key, record)
+        now = time.time()
+        for name in names:
+            value = getattr(song, name)
+            if not value or (name == "lyrics" and is_url(value)):
+                continue
+            setattr(record.song, name, value)
+            record.fresh_until[name] = self._fresh_until(name, value, now)
+
+    def reconcile(self, source: str, songs: list[Song]) -> list[Song]:
+        """
+        用规范记录补全 songs 中仍为空且尚未过期的字段，再把 songs 带来的新字段记下
+        从记录里补上的字段不再记回去，否则每次命中都会延长它们的有效期
+        交出去的是各请求自己的副本，规范记录本身不会被请求修改
+        """
+        now = time.time()
+        for song in songs:
+            incoming = tuple(name for name in _MERGED_FIELDS if getattr(song, name))
+            record = self.get(song.source or source, song.id)
+            if record is not None:
+                for name in record.fresh_fields(now):
+                    if not getattr(song, name):
+                        setattr(song, name, getattr(record.song, name))
+            self.learn(source, song, incoming)
+        return songs
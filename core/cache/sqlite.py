@@ -0,0 +1,167 @@
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+
+from astrbot.api import logger
+
+from .backend import CacheBackend
+from .stats import CacheStats
+
+
+class SqliteStore(CacheBackend):
+    """
+    基于 SQLite 文件的键值存储
+    值为 bytes，读写放到线程里执行，不阻塞事件循环；
+    设置了 max_bytes 时，超出预算后按写入先后淘汰
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        table: str,
+        max_bytes: int = 0,
+        ttl: float | None = None,
+    ):
+        self.db_path = db_path
+        self.table = table
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL
+                )
+            """)
+            self._conn.commit()
+            self._count()
+        return self._conn
+
+    def _count(self) -> None:
+        entries, size = self._conn.execute(  # type: ignore[union-attr]
+            f"SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM {self.table}"
+        ).fetchone()
+        self.stats.entries = entries
+        self.stats.weight = self.stats.bytes = size
+
+    def _size_of(self, key: str) -> int | None:
+        """已有条目的值大小，不存在时为 None"""
+        row = (
+            self._connect()
+            .execute(f"SELECT LENGTH(value) FROM {self.table} WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def _account(self, entries: int, size: int) -> None:
+        self.stats.entries += entries
+        self.stats.weight = self.stats.bytes = self.stats.bytes + size
+
+    def _get(self, key: str) -> bytes | None:
+        row = (
+            self._connect()
+            .execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self._delete(key)
+            return None
+        return value
+
+    def _set(self, key: str, value: bytes, ttl: float | None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        conn = self._connect()
+        # 覆盖已有键时只计入大小的差值
+        old = self._size_of(key)
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) "
+            "VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+        conn.commit()
+        if old is None:
+            self._account(1, len(value))
+        else:
+            self._account(0, len(value) - old)
+        if self.max_bytes and self.stats.bytes > self.max_bytes:
+            self._prune()
+
+    def _prune(self) -> None:
+        """先删过期条目，仍超出预算时按 rowid（即写入先后）删到预算的 90%"""
+        conn = self._connect()
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL "
+            "AND expires_at <= ?",
+            (time.time(),),
+        )
+        self._count()
+        excess = self.stats.bytes - int(self.max_bytes * 0.9)
+        if excess > 0:
+            rows = conn.execute(
+                f"SELECT rowid, LENGTH(value) FROM {self.table} ORDER BY rowid"
+            ).fetchall()
+            doomed = []
+            for rowid, size in rows:
+                if excess <= 0:
+                    break
+                doomed.append((rowid,))
+                excess -= size
+            conn.executemany(f"DELETE FROM {self.table} WHERE rowid = ?", doomed)
+            self.stats.evictions += len(doomed)
+        conn.commit()
+        self._count()
+
+    def _delete(self, key: str) -> None:
+        conn = self._connect()
+        old = self._size_of(key)
+        if old is None:
+            return
+        conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        conn.commit()
+        self._account(-1, -old)
+
+    async def get(self, key: str) -> bytes | None:
+        async with self._lock:
+            try:
+                value = await asyncio.to_thread(self._get, key)
+            except sqlite3.Error as e:
+                logger.warning(f"读取缓存数据库失败: {e}")
+                value = None
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        async with self._lock:
+            try:
+                await asyncio.to_thread(self._set, key, value, ttl)
+            except sqlite3.Error as e:
+                logger.warning(f"写入缓存数据库失败: {e}")
+
+    async def delete(self, key: str) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._delete, key)
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
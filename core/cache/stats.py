@@ -0,0 +1,24 @@
+from dataclasses import asdict, dataclass
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """缓存命中统计"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    """ 因容量淘汰的条目数（过期不计） """
+    entries: int = 0
+    weight: int = 0
+    """ 当前占用的容量（条目数、像素或字节，视缓存而定） """
+    bytes: int = 0
+    """ 当前占用的字节数，只有按字节计量的后端才会统计 """
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
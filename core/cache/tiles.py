@@ -0,0 +1,66 @@
+import struct
+import zlib
+
+from PIL import Image
+
+from ..config import TileCacheConfig
+from .memory import MISSING, TTLCache
+from .serde import Codec
+
+# 图片头：宽、高、模式名长度
+_HEADER = struct.Struct(">HHB")
+
+
+def _pixels(image: Image.Image) -> int:
+    return image.width * image.height
+
+
+def _dump_tile(image: Image.Image) -> bytes:
+    mode = image.mode.encode("ascii")
+    header = _HEADER.pack(image.width, image.height, len(mode))
+    return header + mode + zlib.compress(image.tobytes(), 1)
+
+
+def _load_tile(data: bytes) -> Image.Image:
+    try:
+        width, height, mode_len = _HEADER.unpack_from(data)
+        offset = _HEADER.size + mode_len
+        mode = data[_HEADER.size : offset].decode("ascii")
+        return Image.frombytes(mode, (width, height), zlib.decompress(data[offset:]))
+    except (struct.error, zlib.error) as e:
+        raise ValueError(str(e)) from e
+
+
+TILE = Codec(dumps=_dump_tile, loads=_load_tile)
+""" 卡片图片，按原始像素压缩保存，恢复时无需重新解码 """
+
+
+class TileCache:
+    """
+    选歌卡片的渲染结果缓存
+    保存不含序号角标的成品卡片，按像素总数限制内存占用
+    """
+
+    def __init__(self, config: TileCacheConfig):
+        self.cfg = config
+        self.store = TTLCache(
+            max_weight=config.max_megapixels * 1_000_000,
+            ttl=config.ttl,
+            weigher=_pixels,
+        )
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    @staticmethod
+    def make_key(*parts: object) -> str:
+        return "|".join(str(p) for p in parts)
+
+    def get(self, key: str) -> Image.Image | None:
+        tile = self.store.get(key)
+        return None if tile is MISSING else tile
+
+    def put(self, key: str, tile: Image.Image) -> None:
+        # 调用方只会 copy 后再修改，缓存里的图片保持只读
+        self.store.set(key, tile)
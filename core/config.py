@@ -10,6 +10,7 @@ from astrbot.api import logger
 from astrbot.core.config.astrbot_config import AstrBotConfig
 from astrbot.core.star.context import Context
 from astrbot.core.utils.astrbot_path import (
+    get_astrbot_data_path,
     get_astrbot_plugin_path,
     get_astrbot_temp_path,
 )
@@ -91,6 +92,108 @@ class ConfigNode:
         self._data.save_config()
 
 
+class NetworkConfig(ConfigNode):
+    limit: int
+    limit_per_host: int
+    dns_cache_ttl: int
+    keepalive_timeout: int
+    connect_timeout: float
+    read_timeout: float
+    breaker_failures: int
+    breaker_cooldown: int
+    hedge: bool
+    keep_warm: bool
+    health_interval: int
+    host_concurrency: int
+    max_body_kb: int
+
+
+class WarmerConfig(ConfigNode):
+    interval: int
+    idle_seconds: int
+    lists: int
+    songs_per_list: int
+    budget: int
+
+
+class BackendConfig(ConfigNode):
+    """可切换后端的缓存命名空间的公共配置"""
+
+    backend: str
+    max_entries: int
+    max_mb: int
+
+
+class SearchCacheConfig(BackendConfig):
+    ttl: int
+    negative_ttl: int
+
+
+class EnrichmentCacheConfig(BackendConfig):
+    ttl: int
+    audio_ttl: int
+    negative_ttl: int
+    refresh_margin: int
+
+
+class LyricsCacheConfig(BackendConfig):
+    pass
+
+
+class CommentCacheConfig(BackendConfig):
+    ttl: int
+
+
+class CoverCacheConfig(BackendConfig):
+    max_entries: int = 0
+    """ 封面按字节数限额，不限条目数 """
+
+
+class SelectionImageCacheConfig(BackendConfig):
+    max_entries: int = 0
+    """ 按字节数限额，不限条目数 """
+    ttl: int
+
+
+class MediaCacheConfig(BackendConfig):
+    ttl: int
+
+
+class SongStoreConfig(ConfigNode):
+    max_entries: int
+    ttl: int
+
+
+class TileCacheConfig(ConfigNode):
+    ttl: int
+    max_megapixels: int
+
+
+class LyricsImageCacheConfig(ConfigNode):
+    memory_mb: int
+    disk_mb: int
+
+
+class CZCacheConfig(BackendConfig):
+    ark_ttl: int
+    cover_ttl: int
+
+
+class CacheConfig(ConfigNode):
+    snapshot: bool
+    search: SearchCacheConfig
+    enrichment: EnrichmentCacheConfig
+    songs: SongStoreConfig
+    lyrics: LyricsCacheConfig
+    comments: CommentCacheConfig
+    covers: CoverCacheConfig
+    tiles: TileCacheConfig
+    lyric_images: LyricsImageCacheConfig
+    selection_images: SelectionImageCacheConfig
+    cz: CZCacheConfig
+    media: MediaCacheConfig
+
+
 class PluginConfig(ConfigNode):
     default_player_name: str
     nodejs_base_url: str
@@ -104,6 +207,11 @@ class PluginConfig(ConfigNode):
     enable_comments: bool
     enable_lyrics: bool
     proxy: str
+    proxy_pool: list[str]
+    redis_url: str
+    network: NetworkConfig
+    cache: CacheConfig
+    warmer: WarmerConfig
     timeout: int
     recall_select: bool
     clear_cache: bool
@@ -118,6 +226,9 @@ class PluginConfig(ConfigNode):
         self.plugin_dir = Path(get_astrbot_plugin_path()) / self._plugin_name
         self.font_path = self.plugin_dir / "fonts" / "simhei.ttf"
         self.temp_dir = Path(get_astrbot_temp_path()) / self._plugin_name
+        self.data_dir = (
+            Path(get_astrbot_data_path()) / "plugin_data" / self._plugin_name
+        )
         self.songs_dir = self.temp_dir / "songs"
         self.songs_dir.mkdir(parents=True, exist_ok=True)
 
@@ -5,13 +5,15 @@ import aiohttp
 
 from astrbot.api import logger
 
+from .cache import CZCardCache
 from .config import PluginConfig
 from .model import Song
+from .net import CircuitOpenError, HttpHub
 from .platform import BaseMusicPlayer
 
 
 class CZCard:
-    """Fetch signed CZ music cards with a reusable HTTP session."""
+    """Fetch signed CZ music cards through the shared HTTP hub."""
 
     API_URL = "https://api.czcn.xyz/api/qqyykp"
     FORMAT_MAP = {
@@ -26,15 +28,11 @@ class CZCard:
     }
     REQUIRED_FIELDS = {"app", "meta", "prompt", "view"}
 
-    def __init__(self, config: PluginConfig):
+    def __init__(self, config: PluginConfig, hub: HttpHub, cache: CZCardCache):
         self.ckey = config.cz_ckey
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=config.timeout),
-            proxy=config.http_proxy,
-        )
-
-    async def close(self) -> None:
-        await self.session.close()
+        self.hub = hub
+        self.cache = cache
+        self.timeout = aiohttp.ClientTimeout(total=config.timeout)
 
     async def fetch(self, player: BaseMusicPlayer, song: Song) -> dict[str, Any] | None:
         """Fetch a signed music card.
@@ -44,7 +42,8 @@ class CZCard:
             song: Song data used to build the card.
 
         Returns:
-            The signed card payload, or None when the request fails.
+            The signed card payload, or None when the request fails. Cached
+            payloads are returned while the card and its audio URL are valid.
         """
         if not song.audio_url or not song.cover_url:
             song = await player.fetch_extra(song)
@@ -65,15 +64,12 @@ class CZCard:
         else:
             jump_url = song.audio_url
 
-        try:
-            cover_url = song.cover_url or ""
-            if cover_url:
-                async with self.session.get(
-                    cover_url, allow_redirects=True
-                ) as response:
-                    response.raise_for_status()
-                    cover_url = str(response.url)
+        key = self.cache.make_key(card_format, song.id, song.audio_url)
+        if ark := await self.cache.get_ark(key):
+            return ark
 
+        try:
+            cover_url = await self._resolve_cover(song.cover_url or "")
             params = {
                 "type": card_format,
                 "url": jump_url,
@@ -85,14 +81,57 @@ class CZCard:
             if self.ckey:
                 params["ckey"] = self.ckey
 
-            async with self.session.get(self.API_URL, params=params) as response:
+            async with self.hub.request(
+                "GET", self.API_URL, params=params, timeout=self.timeout
+            ) as response:
                 response.raise_for_status()
                 data = await response.json(content_type=None)
-        except (aiohttp.ClientError, TimeoutError, json.JSONDecodeError) as exc:
+        except (
+            aiohttp.ClientError,
+            TimeoutError,
+            json.JSONDecodeError,
+            CircuitOpenError,
+        ) as exc:
             logger.warning(f"CZ card request failed: {type(exc).__name__}")
             return None
 
         if not isinstance(data, dict) or not self.REQUIRED_FIELDS.issubset(data):
             logger.warning("CZ card returned an invalid payload")
             return None
+        await self.cache.put_ark(key, data, song.audio_url)
         return data
+
+    async def _resolve_cover(self, url: str) -> str:
+        """Follow cover redirects without downloading the image.
+
+        Args:
+            url: Cover URL reported by the player.
+
+        Returns:
+            The final cover URL, or the original one when it cannot be resolved.
+        """
+        if not url:
+            return url
+        if resolved := await self.cache.get_cover(url):
+            return resolved
+
+        attempts = (("HEAD", {}), ("GET", {"Range": "bytes=0-0"}))
+        for method, headers in attempts:
+            try:
+                async with self.hub.request(
+                    method,
+                    url,
+                    headers=headers,
+                    allow_redirects=True,
+                    timeout=self.timeout,
+                ) as response:
+                    if response.status >= 400:
+                        # Some CDNs reject HEAD; retry with a 1-byte range.
+                        continue
+                    resolved = str(response.url)
+            except (aiohttp.ClientError, TimeoutError, CircuitOpenError) as exc:
+                logger.warning(f"CZ card cover lookup failed: {type(exc).__name__}")
+                return url
+            await self.cache.put_cover(url, resolved)
+            return resolved
+        return url
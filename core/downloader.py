@@ -2,29 +2,26 @@ import uuid
 from pathlib import Path
 
 import aiofiles
-import aiohttp
 
 from astrbot.api import logger
 
 from .config import PluginConfig
+from .net import HttpHub
 
 
 class Downloader:
     """下载器"""
 
-    def __init__(self, config: PluginConfig):
+    def __init__(self, config: PluginConfig, hub: HttpHub):
         self.cfg = config
+        self.hub = hub
         self.songs_dir = self.cfg.songs_dir
-        self.session = aiohttp.ClientSession(proxy=self.cfg.http_proxy)
-
-    async def close(self):
-        await self.session.close()
 
     async def download_image(self, url: str, close_ssl: bool = True) -> bytes | None:
         """下载图片"""
         url = url.replace("https://", "http://") if close_ssl else url
         try:
-            async with self.session.get(url) as response:
+            async with self.hub.request("GET", url) as response:
                 img_bytes = await response.read()
                 return img_bytes
         except Exception as e:
@@ -36,7 +33,7 @@ class Downloader:
         song_uuid = uuid.uuid4().hex
         file_path = self.songs_dir / f"{song_uuid}.mp3"
         try:
-            async with self.session.get(url) as response:
+            async with self.hub.request("GET", url, sticky=False) as response:
                 if response.status != 200:
                     logger.error(f"歌曲下载失败，HTTP 状态码：{response.status}")
                     return None
@@ -0,0 +1,134 @@
+"""上游健康探测与延迟记分板"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from astrbot.api import logger
+
+from .cache import bypass_cache
+from .config import PluginConfig
+from .net import RetryPolicy, retry_policy
+from .platform import BaseMusicPlayer
+
+
+@dataclass(slots=True)
+class PlayerHealth:
+    """单个播放器的滚动健康数据"""
+
+    samples: deque[tuple[bool, float]] = field(
+        default_factory=lambda: deque(maxlen=20)
+    )
+    """ 最近的 (是否成功, 耗时秒) 样本 """
+    consecutive_failures: int = 0
+    """ 连续失败次数 """
+    checked_at: float = 0.0
+    """ 最近一次记录的时间（monotonic） """
+
+    @property
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for ok, _ in self.samples if not ok) / len(self.samples)
+
+    @property
+    def latency(self) -> float | None:
+        """成功样本的中位延迟"""
+        ok = sorted(t for success, t in self.samples if success)
+        return ok[len(ok) // 2] if ok else None
+
+
+class Scoreboard:
+    """各播放器的健康记分板，供选路使用"""
+
+    def __init__(self, max_error_rate: float = 0.5, max_failures: int = 3):
+        self.max_error_rate = max_error_rate
+        self.max_failures = max_failures
+        self._health: dict[str, PlayerHealth] = {}
+
+    def record(self, name: str, ok: bool, latency: float) -> None:
+        health = self._health.setdefault(name, PlayerHealth())
+        health.samples.append((ok, latency))
+        health.consecutive_failures = 0 if ok else health.consecutive_failures + 1
+        health.checked_at = time.monotonic()
+
+    def get(self, name: str) -> PlayerHealth | None:
+        return self._health.get(name)
+
+    def is_degraded(self, name: str) -> bool:
+        """没有数据的播放器视为健康"""
+        health = self._health.get(name)
+        if health is None:
+            return False
+        return (
+            health.consecutive_failures >= self.max_failures
+            or health.error_rate > self.max_error_rate
+        )
+
+    def score(self, name: str) -> tuple[float, float]:
+        """越小越健康：(错误率, 中位延迟)"""
+        health = self._health.get(name)
+        if health is None:
+            return (0.0, float("inf"))
+        return (health.error_rate, health.latency or float("inf"))
+
+    def healthiest(
+        self, players: list[BaseMusicPlayer], exclude: BaseMusicPlayer | None = None
+    ) -> BaseMusicPlayer | None:
+        candidates = [
+            p
+            for p in players
+            if p is not exclude and not self.is_degraded(p.platform.name)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda p: self.score(p.platform.name))
+
+
+class HealthProber:
+    """定期向每个播放器发送廉价的探测搜索，结果写入记分板"""
+
+    PROBE_RETRY = RetryPolicy(attempts=1, budget=15.0)
+
+    def __init__(
+        self,
+        config: PluginConfig,
+        players: list[BaseMusicPlayer],
+        scoreboard: Scoreboard,
+    ):
+        self.cfg = config
+        self.players = players
+        self.scoreboard = scoreboard
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.cfg.network.health_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def probe_all(self) -> None:
+        await asyncio.gather(*(self._probe(player) for player in self.players))
+
+    async def _loop(self) -> None:
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.cfg.network.health_interval)
+
+    async def _probe(self, player: BaseMusicPlayer) -> None:
+        name = player.platform.name
+        started = time.monotonic()
+        try:
+            with retry_policy(self.PROBE_RETRY), bypass_cache():
+                ok = await player.probe()
+        except Exception as e:
+            logger.debug(f"{name} 健康探测异常: {e}")
+            ok = False
+        self.scoreboard.record(name, ok, time.monotonic() - started)
+        if self.scoreboard.is_degraded(name):
+            logger.warning(f"{player.platform.display_name} 当前不可用或响应异常")
@@ -1,8 +1,10 @@
+import asyncio
 import io
 import re
 
 from PIL import Image, ImageDraw, ImageFont
 
+from .cache import LyricsImageCache
 from .config import PluginConfig
 
 
@@ -19,16 +21,53 @@ class LyricsTheme:
     def load_font(self, font_path: str) -> ImageFont.FreeTypeFont:
         return ImageFont.truetype(font_path, self.font_size)
 
+    def fingerprint(self) -> tuple:
+        """主题参数的指纹，用作渲染缓存键的一部分"""
+        return tuple(getattr(self, name) for name in LyricsTheme.__annotations__)
+
 
 class LyricsRenderer:
     def __init__(
         self,
         config: PluginConfig,
         theme: LyricsTheme | None = None,
+        images: LyricsImageCache | None = None,
     ):
         self.theme = theme or LyricsTheme()
         self.font_path = config.font_path
         self.font = self.theme.load_font(str(self.font_path))
+        self.images = images
+
+    @staticmethod
+    def clean_lines(lyrics: str) -> list[str]:
+        """去掉时间轴标签，返回逐行歌词"""
+        return [
+            re.sub(r"\[\d{2}:\d{2}(?:\.\d{2,3})?\]", "", line)
+            for line in lyrics.splitlines()
+        ]
+
+    async def render(self, lyrics: str, image_format: str = "JPEG") -> bytes:
+        """
+        按默认主题渲染歌词图片，优先复用缓存
+        渲染在线程中执行，不阻塞事件循环
+        """
+        key = None
+        if self.images is not None:
+            key = self.images.make_key(
+                "\n".join(self.clean_lines(lyrics)),
+                self.theme.fingerprint(),
+                str(self.font_path),
+                image_format,
+            )
+            if (image := await self.images.get(key)) is not None:
+                return image
+
+        image = await asyncio.to_thread(
+            self.draw_lyrics, lyrics, image_format=image_format
+        )
+        if key is not None:
+            await self.images.put(key, image)
+        return image
 
     def draw_lyrics(
         self,
@@ -38,6 +77,7 @@ class LyricsRenderer:
         top_color: tuple[int, int, int] | None = None,
         bottom_color: tuple[int, int, int] | None = None,
         text_color: tuple[int, int, int] | None = None,
+        image_format: str = "JPEG",
     ) -> bytes:
         theme = self.theme
         image_width = image_width if image_width is not None else theme.image_width
@@ -46,11 +86,7 @@ class LyricsRenderer:
         bottom_color = bottom_color or theme.bottom_color
         text_color = text_color or theme.text_color
 
-        lines = lyrics.splitlines()
-        cleaned_lines = []
-        for line in lines:
-            cleaned = re.sub(r"\[\d{2}:\d{2}(?:\.\d{2,3})?\]", "", line)
-            cleaned_lines.append(cleaned if cleaned != "" else "")
+        cleaned_lines = self.clean_lines(lyrics)
 
         dummy_img = Image.new("RGB", (image_width, 1))
         draw = ImageDraw.Draw(dummy_img)
@@ -96,6 +132,6 @@ class LyricsRenderer:
             y += line_height + line_spacing
 
         img_bytes = io.BytesIO()
-        img.save(img_bytes, format="JPEG")
+        img.save(img_bytes, format=image_format)
         img_bytes.seek(0)
         return img_bytes.getvalue()
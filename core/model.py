@@ -1,4 +1,25 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from typing import Any
+
+
+@dataclass(slots=True, frozen=True)
+class Comment:
+    """精简的评论记录"""
+
+    content: str
+    """评论内容"""
+
+    liked_count: int = 0
+    """点赞数"""
+
+    @classmethod
+    def from_hot_comments(cls, raw: list[dict[str, Any]]) -> list["Comment"]:
+        """从网易云 hotComments 原始数据中只取内容和点赞数"""
+        return [
+            cls(content=c["content"], liked_count=int(c.get("likedCount") or 0))
+            for c in raw
+            if isinstance(c, dict) and c.get("content")
+        ]
 
 
 @dataclass(slots=True)
@@ -36,12 +57,19 @@ class Song:
     lyrics: str | None = None
     """歌词"""
 
-    comments: list | None = None
-    """评论列表"""
+    comments: list[Comment] | None = None
+    """热门评论列表"""
 
     note: str | None = None
     """备注，例如来源或额外信息"""
 
+    def merge(self, other: "Song") -> "Song":
+        """用 other 中已有的字段补全本歌曲的空字段"""
+        for f in fields(self):
+            if not getattr(self, f.name) and (value := getattr(other, f.name)):
+                setattr(self, f.name, value)
+        return self
+
     def to_lines(self) -> str:
         """将 Song 信息整理成多行文本"""
         lines = [
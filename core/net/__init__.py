@@ -0,0 +1,45 @@
+from .breaker import BreakerState, CircuitBreaker, CircuitOpenError
+from .codec import (
+    BodyTooLargeError,
+    decode_body,
+    decode_text,
+    json_dumps,
+    json_loads,
+    read_body,
+)
+from .hedge import LatencyTracker, hedged
+from .hub import HttpHub
+from .limiter import AdaptiveLimiter
+from .proxy import ProxyPool, ProxyState
+from .retry import (
+    BACKGROUND_RETRY,
+    INTERACTIVE_RETRY,
+    RetryPolicy,
+    current_retry_policy,
+    retry_policy,
+)
+from .singleflight import SingleFlight
+
+__all__ = [
+    "AdaptiveLimiter",
+    "BACKGROUND_RETRY",
+    "BodyTooLargeError",
+    "BreakerState",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "HttpHub",
+    "INTERACTIVE_RETRY",
+    "LatencyTracker",
+    "ProxyPool",
+    "ProxyState",
+    "RetryPolicy",
+    "SingleFlight",
+    "current_retry_policy",
+    "decode_body",
+    "decode_text",
+    "hedged",
+    "json_dumps",
+    "json_loads",
+    "read_body",
+    "retry_policy",
+]
@@ -0,0 +1,78 @@
+import time
+from enum import Enum
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected by an open circuit breaker."""
+
+    def __init__(self, host: str):
+        super().__init__(f"circuit open for {host}")
+        self.host = host
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects requests for ``cooldown`` seconds. It then turns half-open and
+    lets up to ``half_open_probes`` requests through: a successful probe
+    closes it again, a failed one reopens it for another cool-down.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        half_open_probes: int = 1,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.half_open_probes = max(1, half_open_probes)
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probes = 0
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now. Reserves a probe when half-open."""
+        if self.state is BreakerState.CLOSED:
+            return True
+        if self.state is BreakerState.OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = BreakerState.HALF_OPEN
+            self._probes = 0
+        if self._probes >= self.half_open_probes:
+            return False
+        self._probes += 1
+        return True
+
+    def record_success(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self._probes = 0
+
+    def record_failure(self) -> None:
+        if self.state is BreakerState.HALF_OPEN:
+            self._open()
+            return
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """Give back a probe slot whose request ended without a verdict."""
+        if self.state is BreakerState.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def _open(self) -> None:
+        self.state = BreakerState.OPEN
+        self.opened_at = time.monotonic()
+        self.failures = 0
+        self._probes = 0
@@ -0,0 +1,69 @@
+import json
+import re
+from typing import Any
+
+import aiohttp
+
+try:  # 可选依赖：安装了 orjson 时用它解析 JSON
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
+_BOM = b"\xef\xbb\xbf"
+_CHUNK_SIZE = 64 * 1024
+_JSON_START = re.compile(rb"\s*[\[{]")
+
+
+class BodyTooLargeError(Exception):
+    """Raised when a response body exceeds the caller's size cap."""
+
+    def __init__(self, url: str, limit: int):
+        super().__init__(f"response body over {limit} bytes: {url}")
+        self.url = url
+        self.limit = limit
+
+
+def json_loads(data: bytes) -> Any:
+    """Decode JSON from bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+async def read_body(resp: aiohttp.ClientResponse, max_bytes: int) -> bytes:
+    """Read the raw body, rejecting it as soon as it exceeds ``max_bytes``."""
+    if resp.content_length is not None and resp.content_length > max_bytes:
+        raise BodyTooLargeError(str(resp.url), max_bytes)
+    buf = bytearray()
+    async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
+        buf += chunk
+        if len(buf) > max_bytes:
+            raise BodyTooLargeError(str(resp.url), max_bytes)
+    return bytes(buf)
+
+
+def decode_text(body: bytes, charset: str | None = None) -> str:
+    return body.removeprefix(_BOM).decode(charset or "utf-8", errors="replace")
+
+
+def decode_body(body: bytes, content_type: str, charset: str | None = None) -> Any:
+    """Decode a response body by Content-Type.
+
+    JSON (declared, or sniffed from a leading ``{``/``[`` since several
+    upstreams label JSON as text/html) is parsed straight from bytes without
+    building an intermediate ``str``; anything else is returned as text.
+    """
+    body = body.removeprefix(_BOM)
+    if "json" in content_type or _JSON_START.match(body):
+        try:
+            return json_loads(body)
+        except ValueError:
+            pass
+    return decode_text(body, charset)
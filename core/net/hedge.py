@@ -0,0 +1,138 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from typing import TypeVar
+
+from astrbot.api import logger
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Rolling latency samples per backend, used to rank and hedge calls."""
+
+    def __init__(self, window: int = 50, min_samples: int = 5):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+        """ 成功调用的耗时（秒），失败不计入，以免拉高分位数 """
+        self._outcomes: dict[str, deque[bool]] = {}
+        """ 最近调用是否成功，单独统计错误率 """
+
+    def record(self, key: str, seconds: float, ok: bool = True) -> None:
+        outcomes = self._outcomes.setdefault(key, deque(maxlen=self.window))
+        outcomes.append(ok)
+        if ok:
+            samples = self._samples.setdefault(key, deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def error_rate(self, key: str) -> float:
+        outcomes = self._outcomes.get(key)
+        if not outcomes:
+            return 0.0
+        return outcomes.count(False) / len(outcomes)
+
+    def quantile(self, key: str, q: float) -> float | None:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def p50(self, key: str) -> float | None:
+        return self.quantile(key, 0.5)
+
+    def p95(self, key: str) -> float | None:
+        return self.quantile(key, 0.95)
+
+    def score(self, key: str) -> float | None:
+        """Expected seconds until a successful answer: p50 over success rate.
+
+        Returns None while the backend has fewer than ``min_samples`` calls;
+        a backend whose recent calls all failed scores infinity.
+        """
+        outcomes = self._outcomes.get(key)
+        if not outcomes or len(outcomes) < self.min_samples:
+            return None
+        samples = self._samples.get(key)
+        if not samples:
+            return float("inf")
+        ordered = sorted(samples)
+        return ordered[len(ordered) // 2] / (1.0 - self.error_rate(key))
+
+    def rank(self, keys: Sequence[str]) -> list[str]:
+        """Best known first; backends without enough samples keep their order."""
+        known = [k for k in keys if self.score(k) is not None]
+        unknown = [k for k in keys if self.score(k) is None]
+        known.sort(key=lambda k: self.score(k))  # type: ignore[arg-type, return-value]
+        return known + unknown
+
+
+async def hedged(
+    calls: Sequence[tuple[str, Callable[[], Awaitable[T]]]],
+    tracker: LatencyTracker,
+    *,
+    accept: Callable[[T], bool] = bool,
+    default_delay: float = 1.0,
+    min_delay: float = 0.05,
+) -> T | None:
+    """Run equivalent calls with hedging and return the first acceptable result.
+
+    The fastest known backend is called first. The next one is only started
+    when the running call has not answered within its p95 latency (or
+    ``default_delay`` while there is not enough data), or as soon as a call
+    fails. Slower calls still in flight are cancelled once a winner is found.
+
+    Args:
+        calls: ``(backend key, call factory)`` pairs of equivalent calls.
+        tracker: Latency scoreboard, updated with every finished call.
+        accept: Predicate deciding whether a result counts as an answer.
+        default_delay: Hedge delay used before a backend has enough samples.
+        min_delay: Lower bound for the hedge delay.
+
+    Returns:
+        The first accepted result, or None when every backend failed.
+    """
+    factories = dict(calls)
+    order = tracker.rank([key for key, _ in calls])
+    pending: dict[asyncio.Task, tuple[str, float]] = {}
+
+    def launch() -> str:
+        key = order.pop(0)
+        task = asyncio.ensure_future(factories[key]())
+        pending[task] = (key, time.monotonic())
+        return key
+
+    last_key = launch()
+    try:
+        while pending:
+            timeout = None
+            if order:
+                timeout = max(min_delay, tracker.p95(last_key) or default_delay)
+            done, _ = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                last_key = launch()
+                logger.debug(f"hedge: {last_key} 作为备用请求发出")
+                continue
+            for task in done:
+                key, started = pending.pop(task)
+                elapsed = time.monotonic() - started
+                if exc := task.exception():
+                    logger.debug(f"hedge: {key} 请求异常: {exc!r}")
+                    result = None
+                else:
+                    result = task.result()
+                # 后端答复了就是一次成功调用，即使答复不被 accept 接受
+                tracker.record(key, elapsed, ok=result is not None)
+                if result is not None and accept(result):
+                    return result
+            # 有请求失败了，不必再等延迟，直接换下一个后端
+            if order:
+                last_key = launch()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,231 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Coroutine
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit, urlunsplit
+
+import aiohttp
+
+from astrbot.api import logger
+
+from ..config import PluginConfig
+from .breaker import BreakerState, CircuitBreaker, CircuitOpenError
+from .hedge import LatencyTracker
+from .limiter import AdaptiveLimiter
+from .proxy import ProxyPool
+from .singleflight import SingleFlight
+
+
+class HttpHub:
+    """Shared pooled HTTP client for players, downloader and card signer.
+
+    All upstream traffic borrows the same connector, so keep-alive
+    connections, the DNS cache and per-host connection caps are shared
+    by the whole plugin instead of every component owning its own pool.
+    """
+
+    PROXY_CHECK_INTERVAL = 60
+    PING_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+    def __init__(self, config: PluginConfig):
+        self.cfg = config
+        self._session: aiohttp.ClientSession | None = None
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._limiters: dict[str, AdaptiveLimiter] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.latency = LatencyTracker()
+        self.flights = SingleFlight()
+        self.proxies = ProxyPool(config.proxy_pool or [])
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Pooled session, created lazily on the running event loop."""
+        if self._session is None or self._session.closed:
+            net = self.cfg.network
+            connector = aiohttp.TCPConnector(
+                limit=net.limit,
+                limit_per_host=net.limit_per_host,
+                ttl_dns_cache=net.dns_cache_ttl,
+                keepalive_timeout=net.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                proxy=self.cfg.http_proxy,
+            )
+        return self._session
+
+    def start(self) -> None:
+        """Start background maintenance tasks."""
+        if self.proxies:
+            self._spawn(self._proxy_health_loop())
+
+    def _spawn(self, coro: Coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def keep_warm(self, urls: list[str]) -> None:
+        """Pre-open connections to upstreams in the background and keep them warm.
+
+        Every distinct origin gets a lightweight HEAD right away (DNS lookup,
+        TCP and TLS handshake happen here instead of on the first user
+        request) and again well within the keep-alive timeout, so the pool
+        always holds at least one idle connection per upstream.
+        """
+        origins = list(dict.fromkeys(self._origin(url) for url in urls if url))
+        if origins and self.cfg.network.keep_warm:
+            self._spawn(self._keep_warm_loop(origins))
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return urlunsplit((parts.scheme, parts.netloc, "/", "", ""))
+
+    async def _keep_warm_loop(self, origins: list[str]) -> None:
+        interval = max(5.0, self.cfg.network.keepalive_timeout * 0.75)
+        while True:
+            await asyncio.gather(*(self._ping(origin) for origin in origins))
+            await asyncio.sleep(interval)
+
+    async def _ping(self, origin: str) -> None:
+        # 直接走 session，不经过熔断器和限流器：根路径对 HEAD 回 405/5xx 很常见，
+        # 不能让后台保活请求打开熔断或压低真实请求的并发窗口
+        proxy = self.proxies.choose(urlsplit(origin).hostname or "", sticky=True)
+        try:
+            async with self.session.head(
+                origin,
+                timeout=self.PING_TIMEOUT,
+                allow_redirects=False,
+                **({"proxy": proxy} if proxy else {}),
+            ):
+                pass
+        except (aiohttp.ClientError, TimeoutError) as e:
+            logger.debug(f"预热连接失败 {origin}: {type(e).__name__}")
+
+    async def _proxy_health_loop(self) -> None:
+        while True:
+            await self.proxies.check(self.session)
+            await asyncio.sleep(self.PROXY_CHECK_INTERVAL)
+
+    @property
+    def default_timeout(self) -> aiohttp.ClientTimeout:
+        """Connect/read timeouts used when a caller does not pass its own."""
+        net = self.cfg.network
+        return aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=net.connect_timeout,
+            sock_read=net.read_timeout,
+        )
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """Circuit breaker guarding one upstream host."""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            net = self.cfg.network
+            breaker = CircuitBreaker(
+                failure_threshold=net.breaker_failures,
+                cooldown=net.breaker_cooldown,
+            )
+            self._breakers[host] = breaker
+        return breaker
+
+    def limiter(self, host: str) -> AdaptiveLimiter:
+        """Adaptive concurrency window for one upstream host."""
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            net = self.cfg.network
+            limiter = AdaptiveLimiter(
+                initial=min(4, net.host_concurrency),
+                max_limit=net.host_concurrency,
+            )
+            self._limiters[host] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: aiohttp.ClientTimeout | None = None,
+        sticky: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request through the host's circuit breaker and limiter.
+
+        Connection errors, timeouts, 429 and 5xx responses count as
+        failures for both. Raises ``CircuitOpenError`` without touching the
+        network while the breaker is open. Requests over the host's
+        concurrency window wait for a free slot, which is held until the
+        caller has finished reading the response.
+
+        With a proxy pool configured, each request goes out through a
+        pool proxy: sticky per host by default, or freshly picked when
+        ``sticky`` is False so bulk downloads spread over all egresses.
+        """
+        host = urlsplit(url).hostname or ""
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(host)
+
+        limiter = self.limiter(host)
+        try:
+            await limiter.acquire()
+        except BaseException:
+            breaker.release()
+            raise
+
+        proxy = self.proxies.choose(host, sticky=sticky)
+        if proxy:
+            kwargs["proxy"] = proxy
+
+        verdict: bool | None = None
+        latency: float | None = None
+        try:
+            started = time.monotonic()
+            async with self.session.request(
+                method, url, timeout=timeout or self.default_timeout, **kwargs
+            ) as resp:
+                latency = time.monotonic() - started
+                yield resp
+            verdict = self._healthy(resp.status)
+        except aiohttp.ClientResponseError as e:
+            # 调用方 raise_for_status() 抛出的 4xx 不算接口故障
+            verdict = self._healthy(e.status)
+            raise
+        except (aiohttp.ClientError, TimeoutError):
+            verdict = False
+            raise
+        finally:
+            if proxy and verdict is not None:
+                # 收到了响应就说明代理是通的，上游的 5xx 不算在代理头上
+                self.proxies.report(proxy, latency is not None, latency)
+            limiter.release(verdict, latency)
+            if verdict is None:
+                breaker.release()
+            elif verdict:
+                breaker.record_success()
+            else:
+                self._record_failure(host, breaker)
+
+    @staticmethod
+    def _healthy(status: int) -> bool:
+        return not (status == 429 or status >= 500)
+
+    @staticmethod
+    def _record_failure(host: str, breaker: CircuitBreaker) -> None:
+        was_open = breaker.state is BreakerState.OPEN
+        breaker.record_failure()
+        if not was_open and breaker.state is BreakerState.OPEN:
+            logger.warning(f"{host} 连续请求失败，熔断 {breaker.cooldown} 秒")
+
+    async def close(self) -> None:
+        """Stop background tasks and close the pooled session."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from collections import deque
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency window for one upstream host.
+
+    Healthy responses grow the window by roughly one slot per window's worth
+    of requests; 429/5xx, connection errors and latency spikes halve it (at
+    most once per cool-down so one burst of failures counts once). Requests
+    beyond the window wait in FIFO order instead of hitting the host.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_factor: float = 3.0,
+        cooldown: float = 1.0,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.inflight = 0
+        self.baseline: float | None = None
+        """ 健康请求首字节延迟的 EWMA """
+        self._last_decrease = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for fut in self._waiters if not fut.done())
+
+    async def acquire(self) -> None:
+        if self.inflight < int(self.limit) and not self.queued:
+            self.inflight += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # 已经分到了名额但调用方被取消，把名额还回去
+                self.inflight -= 1
+                self._wake()
+            raise
+
+    def release(self, ok: bool | None, latency: float | None = None) -> None:
+        """Free a slot and adjust the window.
+
+        Args:
+            ok: True for a healthy response, False for overload signals
+                (429/5xx, errors, timeouts), None when there is no verdict.
+            latency: Time to response headers in seconds, if known.
+        """
+        if ok is False:
+            self._decrease()
+        elif ok and latency is not None:
+            if (
+                self.baseline is not None
+                and latency > self.baseline * self.latency_factor
+            ):
+                self._decrease()
+            else:
+                self.baseline = (
+                    latency
+                    if self.baseline is None
+                    else self.baseline * 0.9 + latency * 0.1
+                )
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self.inflight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.inflight < int(self.limit):
+            fut = self._waiters.popleft()
+            if fut.done():
+                continue
+            self.inflight += 1
+            fut.set_result(None)
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit / 2)
@@ -0,0 +1,111 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+import aiohttp
+
+from astrbot.api import logger
+
+
+@dataclass(slots=True)
+class ProxyState:
+    url: str
+    """ 代理地址 """
+    latency: float | None = None
+    """ 首字节延迟的 EWMA（秒） """
+    failures: int = 0
+    """ 连续失败次数 """
+    ejected_until: float = 0.0
+    """ 被剔除到何时（monotonic） """
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+class ProxyPool:
+    """Pool of egress proxies with per-host stickiness and health tracking.
+
+    A host keeps using the proxy it was first given (so keep-alive
+    connections stay warm) until that proxy is ejected. New picks are
+    weighted by inverse latency. A proxy that fails ``max_failures`` times
+    in a row is ejected for ``eject_seconds``; the health check re-measures
+    every proxy and re-admits ejected ones that answer again.
+    """
+
+    CHECK_URL = "http://music.163.com/"
+
+    def __init__(
+        self,
+        proxies: list[str],
+        max_failures: int = 3,
+        eject_seconds: float = 60.0,
+    ):
+        urls = (url.strip() for url in proxies)
+        self.proxies = [ProxyState(url) for url in dict.fromkeys(u for u in urls if u)]
+        self.max_failures = max_failures
+        self.eject_seconds = eject_seconds
+        self._sticky: dict[str, ProxyState] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.proxies)
+
+    def choose(self, host: str, sticky: bool = True) -> str | None:
+        if not self.proxies:
+            return None
+        now = time.monotonic()
+        if sticky:
+            current = self._sticky.get(host)
+            if current is not None and current.available(now):
+                return current.url
+
+        candidates = [p for p in self.proxies if p.available(now)]
+        if not candidates:
+            # 全部被剔除时，选最早恢复的那个，而不是直连
+            return min(self.proxies, key=lambda p: p.ejected_until).url
+
+        known = [p.latency for p in candidates if p.latency]
+        default = sum(known) / len(known) if known else 1.0
+        weights = [1 / max(p.latency or default, 0.01) for p in candidates]
+        chosen = random.choices(candidates, weights=weights)[0]
+        if sticky:
+            self._sticky[host] = chosen
+        return chosen.url
+
+    def report(self, url: str, ok: bool, latency: float | None = None) -> None:
+        state = next((p for p in self.proxies if p.url == url), None)
+        if state is None:
+            return
+        if ok:
+            state.failures = 0
+            state.ejected_until = 0.0
+            if latency is not None:
+                state.latency = (
+                    latency
+                    if state.latency is None
+                    else state.latency * 0.8 + latency * 0.2
+                )
+            return
+        state.failures += 1
+        if state.failures >= self.max_failures:
+            state.ejected_until = time.monotonic() + self.eject_seconds
+            self._sticky = {h: p for h, p in self._sticky.items() if p is not state}
+            logger.warning(f"代理 {url} 连续失败 {state.failures} 次，暂时剔除")
+
+    async def check(self, session: aiohttp.ClientSession) -> None:
+        """Probe every proxy once and update its health."""
+        timeout = aiohttp.ClientTimeout(total=10)
+
+        async def probe(state: ProxyState) -> None:
+            started = time.monotonic()
+            try:
+                async with session.head(
+                    self.CHECK_URL, proxy=state.url, timeout=timeout
+                ):
+                    pass
+            except (aiohttp.ClientError, TimeoutError):
+                self.report(state.url, False)
+                return
+            self.report(state.url, True, time.monotonic() - started)
+
+        await asyncio.gather(*(probe(p) for p in self.proxies))
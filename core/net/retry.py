@@ -0,0 +1,49 @@
+import random
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Retry budget for idempotent upstream calls."""
+
+    attempts: int = 3
+    """ 最多请求次数（含第一次） """
+    base_delay: float = 0.2
+    """ 第一次重试前的退避上限（秒），之后按 2 的幂增长 """
+    max_delay: float = 2.0
+    """ 单次退避的上限（秒） """
+    budget: float = 5.0
+    """ 整个调用（含所有重试与等待）的总时间预算（秒） """
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt``."""
+        cap = min(self.max_delay, self.base_delay * (2**attempt))
+        return random.uniform(0, cap)
+
+
+INTERACTIVE_RETRY = RetryPolicy(attempts=2, base_delay=0.2, max_delay=0.5, budget=4.0)
+""" 用户正在等待的请求：少重试、总耗时短 """
+
+BACKGROUND_RETRY = RetryPolicy(attempts=4, base_delay=0.5, max_delay=5.0, budget=30.0)
+""" 后台预取等请求：可以多等一会儿 """
+
+_current_policy: ContextVar[RetryPolicy] = ContextVar(
+    "music_retry_policy", default=INTERACTIVE_RETRY
+)
+
+
+def current_retry_policy() -> RetryPolicy:
+    return _current_policy.get()
+
+
+@contextmanager
+def retry_policy(policy: RetryPolicy) -> Iterator[RetryPolicy]:
+    """Declare the retry budget for every idempotent call made inside the block."""
+    token = _current_policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _current_policy.reset(token)
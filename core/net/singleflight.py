@@ -0,0 +1,44 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce identical in-flight calls.
+
+    While a call for ``key`` is running, later callers with the same key
+    await the same task instead of starting their own. The task is shielded,
+    so a caller that gives up does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def inflight(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[T]]
+    ) -> tuple[T, bool]:
+        """Run ``fn`` once per key at a time.
+
+        Returns:
+            The call result and whether it was shared from another caller.
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # 所有调用方都已放弃时，避免 "exception was never retrieved"
+            task.exception()
@@ -1,13 +1,250 @@
-import json
+import asyncio
+import functools
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import replace
 from typing import ClassVar
 
 import aiohttp
 
 from astrbot.api import logger
 
+from ..cache import CacheHub, Enrichment, cache_bypassed
 from ..config import PluginConfig
-from ..model import Platform, Song
+from ..model import Comment, Platform, Song
+from ..net import (
+    BodyTooLargeError,
+    CircuitOpenError,
+    HttpHub,
+    current_retry_policy,
+    decode_body,
+    decode_text,
+    read_body,
+)
+from ..utils import is_url
+
+
+class _Answers:
+    """记录一次包装调用期间是否收到过上游的有效答复"""
+
+    __slots__ = ("answered",)
+
+    def __init__(self):
+        self.answered = False
+
+
+# 对冲请求在子任务里执行，这里放可变对象，子任务的标记调用方也能看到
+_answers: ContextVar[_Answers | None] = ContextVar(
+    "music_upstream_answers", default=None
+)
+
+
+def _mark_answered() -> None:
+    """上游给出了有效答复，记到当前包装调用上"""
+    if (answers := _answers.get()) is not None:
+        answers.answered = True
+
+
+def _shared_search(method: Callable) -> Callable:
+    """
+    包装 fetch_songs：
+    - 先查搜索缓存（含空结果的短期缓存，仅在上游确实答复时写入）
+    - 同一搜索正在进行时，后来者直接等待同一次请求的结果
+    - 缓存由多个节点共享时，再用分布式锁保证只有一个节点请求上游
+    - 结果与歌曲身份映射对账，之前补全过的字段直接带上
+    """
+
+    @functools.wraps(method)
+    async def wrapper(
+        self: "BaseMusicPlayer", keyword: str, limit: int = 5, extra=None
+    ) -> list[Song]:
+        cache = self.caches.search
+        key = cache.make_key(
+            self.platform.name, self.search_scope(extra), keyword, limit
+        )
+        songs_store = self.caches.songs
+        if not cache_bypassed() and (cached := await cache.get(key)) is not None:
+            return songs_store.reconcile(self.platform.name, cached)
+
+        async def load() -> list[Song]:
+            async with cache.store.lock(key) as waited:
+                # 等过其他节点的锁，说明结果多半已经写进共享缓存
+                if (
+                    waited
+                    and not cache_bypassed()
+                    and (cached := await cache.get(key)) is not None
+                ):
+                    return cached
+                answers = _Answers()
+                token = _answers.set(answers)
+                try:
+                    songs = await method(self, keyword, limit, extra)
+                finally:
+                    _answers.reset(token)
+                # 超时、熔断等失败也会返回空列表，只有上游确实答复过才缓存空结果
+                if songs or answers.answered:
+                    await cache.put(key, songs)
+                return songs
+
+        songs, shared = await self.hub.flights.do((method.__qualname__, key), load)
+        # 共享来的结果复制一份，各请求随后的补全互不干扰
+        if shared:
+            songs = [replace(s) for s in songs]
+        return songs_store.reconcile(self.platform.name, songs)
+
+    wrapper.__shared_call__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _learn_song(method: Callable) -> Callable:
+    """把补全调用的结果合并进歌曲身份映射，下次搜到同一首歌时直接带上"""
+
+    @functools.wraps(method)
+    async def wrapper(self: "BaseMusicPlayer", song: Song) -> Song:
+        song = await method(self, song)
+        if song is not None:
+            self.caches.songs.learn(self.platform.name, song)
+        return song
+
+    wrapper.__shared_call__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _shared_song_call(*key_fields: str) -> Callable[[Callable], Callable]:
+    """
+    包装 fetch_extra / fetch_lyrics / fetch_comments / resolve_lyrics：
+    同一首歌的同一调用正在进行时，后来者等待其结果并合并到自己的 Song 上
+    :param key_fields: 除来源和 ID 外还需区分的 Song 字段
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        async def wrapper(self: "BaseMusicPlayer", song: Song) -> Song:
+            key = (
+                self.platform.name,
+                method.__qualname__,
+                song.source,
+                str(song.id),
+                *(getattr(song, f) for f in key_fields),
+            )
+            result, shared = await self.hub.flights.do(
+                key, lambda: method(self, song)
+            )
+            if shared and result is not None:
+                return song.merge(result)
+            return result
+
+        wrapper.__shared_call__ = True  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def _shared_extra(method: Callable) -> Callable:
+    """
+    包装 fetch_extra：先查补全缓存，音频链接仍新鲜或已知无音源时不再请求上游；
+    只有上游确实答复了却没给音频链接，才记为无音源；
+    音频链接临近过期时只补上封面和歌词，再重新获取音频；
+    缓存由多个节点共享时，同一首歌同时只有一个节点请求上游
+    """
+    method = _shared_song_call()(method)
+
+    @functools.wraps(method)
+    async def wrapper(self: "BaseMusicPlayer", song: Song) -> Song:
+        cache = self.caches.enrichment
+        key = cache.make_key(song.source or self.platform.name, song.id)
+
+        def usable(entry: Enrichment | None) -> bool:
+            return entry is not None and (
+                not entry.playable or cache.audio_fresh(entry)
+            )
+
+        entry = None if cache_bypassed() else await cache.get(key)
+        if usable(entry):
+            return entry.apply(song)  # type: ignore[union-attr]
+
+        async with cache.store.lock(key) as waited:
+            if waited and not cache_bypassed():
+                fresh = await cache.get(key)
+                if usable(fresh):
+                    return fresh.apply(song)  # type: ignore[union-attr]
+                entry = fresh or entry
+            if entry is not None:
+                entry.apply(song, with_audio=False)
+                if song.audio_url == entry.audio_url:
+                    song.audio_url = None
+            answers = _Answers()
+            token = _answers.set(answers)
+            try:
+                song = await method(self, song)
+            finally:
+                _answers.reset(token)
+            # 超时、熔断、无响应时不知道有没有音源，不记为“无音源”
+            if song.audio_url or answers.answered:
+                await cache.put(key, song)
+        return song
+
+    return _learn_song(wrapper)
+
+
+def _stored_lyrics(method: Callable) -> Callable:
+    """
+    包装 fetch_lyrics / resolve_lyrics：先读歌词库，命中则不再请求上游；
+    上游确实答复过、且拿到歌词正文（而非歌词 URL）时才写回歌词库
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: "BaseMusicPlayer", song: Song) -> Song:
+        if song.lyrics and not is_url(song.lyrics):
+            return await method(self, song)
+        store = self.caches.lyrics
+        key = store.make_key(song.source or self.platform.name, song.id)
+        if not cache_bypassed() and (lyrics := await store.get(key)):
+            song.lyrics = lyrics
+            return song
+        answers = _Answers()
+        token = _answers.set(answers)
+        try:
+            song = await method(self, song)
+        finally:
+            _answers.reset(token)
+        # 歌词库不过期，失败时留下的占位内容不能写进去
+        if answers.answered and song.lyrics and not is_url(song.lyrics):
+            await store.put(key, song.lyrics)
+        return song
+
+    return _learn_song(wrapper)
+
+
+def _cached_comments(method: Callable) -> Callable:
+    """包装 fetch_comments：先查热评缓存，各网易云通道共用同一份"""
+    method = _shared_song_call()(method)
+
+    @functools.wraps(method)
+    async def wrapper(self: "BaseMusicPlayer", song: Song) -> Song:
+        if song.comments:
+            return song
+        cache = self.caches.comments
+        key = cache.make_key(song.source or self.platform.name, song.id)
+        if not cache_bypassed() and (comments := await cache.get(key)):
+            song.comments = comments
+            return song
+        song = await method(self, song)
+        await cache.put(key, song)
+        return song
+
+    return _learn_song(wrapper)
+
+
+_SHARED_CALLS: dict[str, Callable[[Callable], Callable]] = {
+    "fetch_songs": _shared_search,
+    "fetch_extra": _shared_extra,
+    "fetch_lyrics": lambda m: _stored_lyrics(_shared_song_call()(m)),
+    "fetch_comments": _cached_comments,
+    "resolve_lyrics": lambda m: _stored_lyrics(_shared_song_call("lyrics")(m)),
+}
 
 
 class BaseMusicPlayer(ABC):
@@ -32,13 +269,31 @@ class BaseMusicPlayer(ABC):
         )
     }
 
-    def __init__(self, config: PluginConfig):
+    TIMEOUT: ClassVar[aiohttp.ClientTimeout | None] = None
+    """ 平台接口的连接/读取超时，为 None 时使用全局配置 """
+
+    LYRICS_TIMEOUT = aiohttp.ClientTimeout(sock_connect=5, sock_read=5)
+
+    CANARY_KEYWORD: ClassVar[str] = "晴天"
+    """ 健康探测时使用的搜索词 """
+
+    def __init__(self, config: PluginConfig, hub: HttpHub, caches: CacheHub):
         self.cfg = config
-        self.session = aiohttp.ClientSession(proxy=self.cfg.http_proxy)
+        self.hub = hub
+        self.caches = caches
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """共享连接池中的 session"""
+        return self.hub.session
 
     def __init_subclass__(cls, **kwargs):
-        """自动注册子类到 _registry"""
+        """自动注册子类到 _registry，并包装子类覆盖的上游调用"""
         super().__init_subclass__(**kwargs)
+        for name, wrap in _SHARED_CALLS.items():
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "__shared_call__", False):
+                setattr(cls, name, wrap(method))
         if ABC not in cls.__bases__:  # 跳过抽象类
             BaseMusicPlayer._registry.append(cls)
 
@@ -62,11 +317,36 @@ class BaseMusicPlayer(ABC):
         raise NotImplementedError
 
     # ---------- 可复用方法 ----------
+    def search_scope(self, extra: str | None) -> str:
+        """
+        搜索的子平台标识，同一关键词在不同子平台下的结果互不相同
+        :param extra: fetch_songs 的额外参数
+        """
+        return ""
+
+    async def probe(self) -> bool:
+        """健康探测：搜索一首常见歌曲，能搜到即视为可用"""
+        songs = await self.fetch_songs(keyword=self.CANARY_KEYWORD, limit=1)
+        return bool(songs)
+
+    def upstreams(self) -> list[str]:
+        """平台会访问的上游地址，用于启动时预热连接"""
+        return ["https://api.qijieya.cn/meting/", "https://music.163.com/"]
+
+    async def fetch_charts(self, lists: int, limit: int) -> list[Song]:
+        """
+        热门榜单中的歌曲，供空闲时预热缓存，不提供榜单的平台返回空列表
+        :param lists: 最多读取的榜单数
+        :param limit: 每个榜单最多取的歌曲数
+        """
+        return []
+
+    @_shared_extra
     async def fetch_extra(self, song: Song) -> Song:
         """默认获取额外信息的实现"""
         url = f"https://api.qijieya.cn/meting/?type=song&id={song.id}"
 
-        result = await self._request(url)
+        result = await self._request(url, idempotent=True)
 
         if result and isinstance(result, list) and len(result) > 0:
             data = result[0]
@@ -78,6 +358,7 @@ class BaseMusicPlayer(ABC):
                 song.lyrics = data.get("lrc")
         return song
 
+    @_cached_comments
     async def fetch_comments(self, song: Song) -> Song:
         """
         默认获取热门评论的实现
@@ -93,6 +374,7 @@ class BaseMusicPlayer(ABC):
                     "params": self.cfg.enc_params,
                     "encSecKey": self.cfg.enc_sec_key,
                 },
+                idempotent=True,
             )
         except Exception as e:
             logger.warning(f"{self.__class__.__name__} fetch_comments 失败: {e}")
@@ -101,10 +383,12 @@ class BaseMusicPlayer(ABC):
         comments = result.get("hotComments") if isinstance(result, dict) else []
 
         if comments:
-            song.comments = comments
+            song.comments = Comment.from_hot_comments(comments)
 
         return song
 
+    @_stored_lyrics
+    @_shared_song_call()
     async def fetch_lyrics(self, song: Song):
         """
         默认获取歌词的实现
@@ -113,40 +397,42 @@ class BaseMusicPlayer(ABC):
             return song
         url = f"https://api.qijieya.cn/meting/?server=netease&type=lrc&id={song.id}"
         try:
-            result = await self._request(url)
-            lyrics = result.get("lyric") if isinstance(result, dict) else str(result)
-            song.lyrics = lyrics
+            result = await self._request(url, idempotent=True)
+            lyrics = result.get("lyric") if isinstance(result, dict) else result
+            if lyrics and isinstance(lyrics, str):
+                song.lyrics = lyrics
             return song
         except Exception as e:
             logger.warning(f"{self.__class__.__name__} fetch_lyrics 失败: {e}")
             return song
 
+    @_stored_lyrics
+    @_shared_song_call("lyrics")
     async def resolve_lyrics(self, song: Song) -> Song:
         """将歌词 URL 解析为歌词正文。"""
-        lyrics = song.lyrics.strip() if isinstance(song.lyrics, str) else ""
-        if not lyrics.startswith(("http://", "https://")):
+        if not is_url(song.lyrics):
             return song
+        lyrics = song.lyrics.strip()  # type: ignore[union-attr]
 
         try:
-            async with self.session.get(lyrics, headers=self.HEADERS) as resp:
+            async with self.hub.request(
+                "GET", lyrics, headers=self.HEADERS, timeout=self.LYRICS_TIMEOUT
+            ) as resp:
                 if resp.status != 200:
                     logger.warning(f"歌词 URL 请求返回 {resp.status}: {lyrics}")
                     return song
 
-                content = (await resp.text()).strip("\ufeff").strip()
+                body = await read_body(resp, self.cfg.network.max_body_kb * 1024)
+                content = decode_text(body, resp.charset).strip()
                 logger.debug(f"已成功解析歌词URL: {lyrics}")
                 if content:
                     song.lyrics = content
+                    _mark_answered()
         except Exception as e:
             logger.warning(f"{self.__class__.__name__} resolve_lyrics 失败: {e}")
 
         return song
 
-    async def close(self):
-        """释放 session"""
-        if not self.session.closed:
-            await self.session.close()
-
     # ---------- 内部 HTTP 方法 ----------
 
     async def _request(
@@ -158,37 +444,96 @@ class BaseMusicPlayer(ABC):
         headers: dict | None = None,
         cookies: dict | None = None,
         ssl: bool = True,
+        timeout: aiohttp.ClientTimeout | None = None,
+        idempotent: bool = False,
+        max_bytes: int | None = None,
     ):
+        """
+        发送请求并解析响应，失败时返回 None
+        :param max_bytes: 响应体大小上限，超出即放弃，默认取配置 max_body_kb
+        :param idempotent: 幂等请求（搜索、歌词、歌曲链接、热评等）会在
+            连接失败、429、5xx 时按当前重试策略做带抖动的指数退避重试，
+            重试预算由调用方通过 retry_policy() 声明；会重试时，每次请求的
+            总超时都不超过预算的剩余时间，只发一次的请求仍按原超时
+        """
         headers = headers or self.HEADERS
-
-        if method.upper() == "POST":
-            async with self.session.post(
-                url, data=data, headers=headers, cookies=cookies, ssl=ssl
-            ) as resp:
-                return await self._parse_response(resp)
-
-        async with self.session.get(
-            url, headers=headers, cookies=cookies, ssl=ssl
-        ) as resp:
-            return await self._parse_response(resp)
-
-    async def _parse_response(self, resp: aiohttp.ClientResponse):
+        method = method.upper()
+        policy = current_retry_policy()
+        attempts = policy.attempts if idempotent else 1
+        deadline = time.monotonic() + policy.budget
+        base_timeout = timeout or self.TIMEOUT or self.hub.default_timeout
+
+        for attempt in range(attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            attempt_timeout = base_timeout
+            if attempts > 1:
+                attempt_timeout = aiohttp.ClientTimeout(
+                    total=min(base_timeout.total or remaining, remaining),
+                    connect=base_timeout.connect,
+                    sock_connect=base_timeout.sock_connect,
+                    sock_read=base_timeout.sock_read,
+                )
+            retryable = False
+            try:
+                async with self.hub.request(
+                    method,
+                    url,
+                    data=data if method == "POST" else None,
+                    headers=headers,
+                    cookies=cookies,
+                    ssl=ssl,
+                    timeout=attempt_timeout,
+                ) as resp:
+                    retryable = resp.status == 429 or resp.status >= 500
+                    result = await self._parse_response(resp, max_bytes)
+                    if not retryable:
+                        if result is not None:
+                            _mark_answered()
+                        return result
+            except CircuitOpenError as e:
+                logger.debug(f"{self.__class__.__name__} 跳过请求: {e}")
+                return None
+            except BodyTooLargeError as e:
+                logger.warning(f"{self.__class__.__name__} 响应过大，已放弃: {e}")
+                return None
+            except (aiohttp.ClientError, TimeoutError) as e:
+                retryable = True
+                logger.warning(
+                    f"{self.__class__.__name__} 请求失败: {type(e).__name__} {url}"
+                )
+
+            if attempt + 1 >= attempts:
+                break
+            delay = policy.backoff(attempt)
+            if time.monotonic() + delay >= deadline:
+                break
+            logger.debug(f"{delay:.2f} 秒后重试({attempt + 1}): {url}")
+            await asyncio.sleep(delay)
+        return None
+
+    async def _parse_response(
+        self, resp: aiohttp.ClientResponse, max_bytes: int | None = None
+    ):
         try:
-            resp_text = await resp.text()
-
             if resp.status != 200:
-                logger.warning(f"HTTP 请求返回 {resp.status}: {resp_text[:200]}")
+                head = decode_text(await resp.content.read(200), resp.charset)
+                logger.warning(f"HTTP 请求返回 {resp.status}: {head}")
                 return None
 
-            if not resp_text.strip():
+            body = await read_body(
+                resp, max_bytes or self.cfg.network.max_body_kb * 1024
+            )
+            if not body.strip():
                 logger.warning("HTTP 响应为空")
                 return None
 
-            try:
-                return json.loads(resp_text)
-            except json.JSONDecodeError:
-                return resp_text
+            return decode_body(body, resp.content_type, resp.charset)
 
+        except (aiohttp.ClientError, TimeoutError, BodyTooLargeError):
+            # 交给 _request 处理，网络错误同时计入熔断统计
+            raise
         except Exception as e:
             logger.warning(f"解析响应失败: {e}")
             return None
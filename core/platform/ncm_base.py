@@ -0,0 +1,208 @@
+from abc import ABC
+from collections.abc import Awaitable, Callable
+from typing import Any, ClassVar
+
+from astrbot.api import logger
+
+from ..model import Song
+from ..net import hedged
+from .base import BaseMusicPlayer
+
+"""
+网易云音乐的三条等价通道
+
+- web: 网易云 Web API（music.163.com）
+- nodejs: 网易云 NodeJS API（nodejs_base_url）
+- meting: meting 代理（api.qijieya.cn）
+
+开启对冲请求时，先请求已知最快的通道，超过其 p95 延迟仍未返回才向备用通道
+补发一次请求，取先返回的结果并取消较慢的请求。
+"""
+
+
+class NetEaseBase(BaseMusicPlayer, ABC):
+    """
+    网易云音乐各通道的公共实现
+    子类通过 BACKENDS 声明每类操作的通道优先级
+    """
+
+    BACKENDS: ClassVar[dict[str, tuple[str, ...]]]
+    """ 操作 -> 通道优先级，如 {"search": ("web", "nodejs")} """
+
+    SOURCE = "netease"
+    """ 各通道返回的是同一套歌曲 ID，统一标记为同一来源 """
+
+    def upstreams(self) -> list[str]:
+        return [
+            "http://music.163.com/",
+            self.cfg.nodejs_base_url,
+            *super().upstreams(),
+        ]
+
+    async def fetch_songs(
+        self, keyword: str, limit: int = 5, extra: str | None = None
+    ) -> list[Song]:
+        songs = await self._hedge(
+            "search",
+            {
+                "web": lambda: self._search_web(keyword, limit),
+                "nodejs": lambda: self._search_nodejs(keyword, limit),
+            },
+            # 空列表是正常的“无结果”答复，不必再问备用通道
+            accept=lambda songs: isinstance(songs, list),
+        )
+        return songs or []
+
+    async def fetch_extra(self, song: Song) -> Song:
+        # 只有音频链接参与对冲；封面、歌词取自任何返回了的通道，
+        # VIP 或地区受限的歌曲没有音频链接，但 meting 仍会给出封面和歌词
+        merged: dict[str, str] = {}
+
+        def collect(
+            call: Callable[[], Awaitable[dict[str, str | None] | None]],
+        ) -> Callable[[], Awaitable[dict[str, str | None] | None]]:
+            async def run() -> dict[str, str | None] | None:
+                info = await call()
+                for field, value in (info or {}).items():
+                    if value:
+                        merged.setdefault(field, value)
+                return info
+
+            return run
+
+        await self._hedge(
+            "extra",
+            {
+                "meting": collect(lambda: self._extra_meting(song)),
+                "nodejs": collect(lambda: self._extra_nodejs(song)),
+            },
+            accept=lambda info: bool(info.get("audio_url")),
+        )
+        for field, value in merged.items():
+            if not getattr(song, field):
+                setattr(song, field, value)
+        return song
+
+    async def fetch_lyrics(self, song: Song) -> Song:
+        if song.lyrics:
+            return song
+        lyrics = await self._hedge(
+            "lyrics",
+            {
+                "meting": lambda: self._lyrics_meting(song),
+                "nodejs": lambda: self._lyrics_nodejs(song),
+            },
+        )
+        if lyrics:
+            song.lyrics = lyrics
+        return song
+
+    # ---------- 对冲调度 ----------
+
+    async def _hedge(
+        self,
+        op: str,
+        calls: dict[str, Callable[[], Awaitable[Any]]],
+        accept: Callable[[Any], bool] = bool,
+    ) -> Any:
+        backends = self.BACKENDS[op]
+        if not self.cfg.network.hedge:
+            result = await calls[backends[0]]()
+            return result if result is not None and accept(result) else None
+        return await hedged(
+            [(f"netease:{op}:{name}", calls[name]) for name in backends],
+            self.hub.latency,
+            accept=accept,
+        )
+
+    # ---------- 搜索 ----------
+
+    def _parse_songs(self, result: Any, limit: int) -> list[Song] | None:
+        if (
+            not isinstance(result, dict)
+            or not isinstance(result.get("result"), dict)
+            or "songs" not in result["result"]
+        ):
+            logger.error(f"返回了意料之外数据：{result}")
+            return None
+
+        return [
+            Song(
+                id=s.get("id"),
+                source=self.SOURCE,
+                name=s.get("name"),
+                artists="、".join(a["name"] for a in s["artists"]),
+                duration=s.get("duration"),
+            )
+            for s in result["result"]["songs"][:limit]
+        ]
+
+    async def _search_web(self, keyword: str, limit: int) -> list[Song] | None:
+        result = await self._request(
+            url="http://music.163.com/api/search/get/web",
+            method="POST",
+            data={"s": keyword, "limit": limit, "type": 1, "offset": 0},
+            cookies={"appver": "2.0.2"},
+            idempotent=True,
+        )
+        return self._parse_songs(result, limit)
+
+    async def _search_nodejs(self, keyword: str, limit: int) -> list[Song] | None:
+        result = await self._request(
+            url=f"{self.cfg.nodejs_base_url}/search",
+            method="POST",
+            data={"keywords": keyword, "limit": limit, "type": 1, "offset": 0},
+            idempotent=True,
+        )
+        return self._parse_songs(result, limit)
+
+    # ---------- 音频、封面、歌词 ----------
+
+    async def _extra_meting(self, song: Song) -> dict[str, str | None] | None:
+        result = await self._request(
+            f"https://api.qijieya.cn/meting/?type=song&id={song.id}",
+            idempotent=True,
+        )
+        if not result or not isinstance(result, list):
+            return None
+        data = result[0]
+        return {
+            "audio_url": data.get("url"),
+            "cover_url": data.get("pic"),
+            "lyrics": data.get("lrc"),
+        }
+
+    async def _extra_nodejs(self, song: Song) -> dict[str, str | None] | None:
+        result = await self._request(
+            url=f"{self.cfg.nodejs_base_url}/song/url?id={song.id}",
+            method="GET",
+            idempotent=True,
+        )
+        if not isinstance(result, dict):
+            logger.error(f"返回了意料之外数据：{result}")
+            return None
+        # NodeJS API 返回结构示例:
+        # { "data": [ { "url": "...", ... } ] }
+        data = result.get("data")
+        if not data:
+            return None
+        return {"audio_url": data[0].get("url")}
+
+    async def _lyrics_meting(self, song: Song) -> str | None:
+        result = await self._request(
+            f"https://api.qijieya.cn/meting/?server=netease&type=lrc&id={song.id}",
+            idempotent=True,
+        )
+        if result is None:
+            return None
+        lyrics = result.get("lyric") if isinstance(result, dict) else str(result)
+        return lyrics or None
+
+    async def _lyrics_nodejs(self, song: Song) -> str | None:
+        result = await self._request(
+            f"{self.cfg.nodejs_base_url}/lyric?id={song.id}", idempotent=True
+        )
+        if not isinstance(result, dict) or "lrc" not in result:
+            logger.error(f"返回了意料之外数据：{result}")
+            return None
+        return result["lrc"].get("lyric") or None
@@ -1,13 +1,15 @@
-from typing import ClassVar
+from typing import Any, ClassVar
 
 from astrbot.api import logger
 
+from ..cache import CacheHub
 from ..config import PluginConfig
-from ..model import Platform, Song
-from .base import BaseMusicPlayer
+from ..model import Comment, Platform, Song
+from ..net import HttpHub
+from .ncm_base import NetEaseBase
 
 
-class NetEaseMusicNodeJS(BaseMusicPlayer):
+class NetEaseMusicNodeJS(NetEaseBase):
     """
     网易云音乐 NodeJS API
     """
@@ -18,34 +20,51 @@ class NetEaseMusicNodeJS(BaseMusicPlayer):
         keywords=["nj点歌", "网易nj"],
     )
 
-    def __init__(self, config: PluginConfig):
-        super().__init__(config)
+    BACKENDS = {
+        "search": ("nodejs", "web"),
+        "extra": ("nodejs", "meting"),
+        "lyrics": ("nodejs", "meting"),
+    }
 
-    async def fetch_songs(self, keyword: str, limit: int = 5, extra=None) -> list[Song]:
+    def __init__(self, config: PluginConfig, hub: HttpHub, caches: CacheHub):
+        super().__init__(config, hub, caches)
+
+    async def fetch_charts(self, lists: int, limit: int) -> list[Song]:
+        """按 /toplist 的顺序读取前几个榜单，同一首歌只保留一次"""
+        if not self.cfg.nodejs_base_url:
+            return []
         result = await self._request(
-            url=f"{self.cfg.nodejs_base_url}/search",
-            method="POST",
-            data={"keywords": keyword, "limit": limit, "type": 1, "offset": 0},
+            f"{self.cfg.nodejs_base_url}/toplist", idempotent=True
         )
-        if (
-            not isinstance(result, dict)
-            or "result" not in result
-            or "songs" not in result["result"]
-        ):
+        if not isinstance(result, dict) or not isinstance(result.get("list"), list):
             logger.error(f"返回了意料之外数据：{result}")
             return []
 
-        songs = result.get("result", {}).get("songs", [])[:limit]
-
-        return [
-            Song(
-                id=s.get("id"),
-                name=s.get("name"),
-                artists="、".join(a["name"] for a in s["artists"]),
-                duration=s.get("duration"),
+        songs: dict[Any, Song] = {}
+        for toplist in result["list"][:lists]:
+            tracks = await self._request(
+                f"{self.cfg.nodejs_base_url}/playlist/track/all"
+                f"?id={toplist.get('id')}&limit={limit}",
+                idempotent=True,
             )
-            for s in songs
-        ]
+            if not isinstance(tracks, dict) or not isinstance(
+                tracks.get("songs"), list
+            ):
+                logger.error(f"返回了意料之外数据：{tracks}")
+                continue
+            # 封面留给 fetch_extra 补全，与搜索结果用同一个地址，缓存才能命中
+            for s in tracks["songs"][:limit]:
+                songs.setdefault(
+                    s.get("id"),
+                    Song(
+                        id=s.get("id"),
+                        source=self.SOURCE,
+                        name=s.get("name"),
+                        artists="、".join(a["name"] for a in s.get("ar") or []),
+                        duration=s.get("dt"),
+                    ),
+                )
+        return list(songs.values())
 
     async def fetch_comments(self, song: Song) -> Song:
         if song.comments:
@@ -54,48 +73,11 @@ class NetEaseMusicNodeJS(BaseMusicPlayer):
             url=f"{self.cfg.nodejs_base_url}/comment/hot",
             method="POST",
             data={"id": song.id, "type": 0},
+            idempotent=True,
         )
         if not isinstance(result, dict) or "hotComments" not in result:
             logger.error(f"返回了意料之外数据：{result}")
             return song
         if comments := result.get("hotComments"):
-            song.comments = comments
-        return song
-
-    async def fetch_lyrics(self, song: Song) -> Song:
-        if song.lyrics:
-            return song
-        result = await self._request(f"{self.cfg.nodejs_base_url}/lyric?id={song.id}")
-        if not isinstance(result, dict) or "lrc" not in result:
-            logger.error(f"返回了意料之外数据：{result}")
-            return song
-        lyric = result["lrc"].get("lyric")
-        if lyric:
-            song.lyrics = lyric
-        return song
-
-    async def fetch_extra(self, song: Song) -> Song:
-        try:
-            result = await self._request(
-                url=f"{self.cfg.nodejs_base_url}/song/url?id={song.id}",
-                method="GET",
-            )
-            if not isinstance(result, dict):
-                logger.error(f"返回了意料之外数据：{result}")
-                return song
-        except Exception as e:
-            logger.warning(f"{self.__class__.__name__} fetch_extra 失败: {e}")
-            return song
-
-        # NodeJS API 返回结构示例:
-        # { "data": [ { "url": "...", ... } ] }
-        data = result.get("data")
-        if not data:
-            return song
-
-        info = data[0]
-        audio_url = info.get("url")
-        if audio_url and song.audio_url is None:
-            song.audio_url = audio_url
-
+            song.comments = Comment.from_hot_comments(comments)
         return song
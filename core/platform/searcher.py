@@ -2,6 +2,8 @@ import aiohttp
 
 from astrbot.api import logger
 
+from ..net import HttpHub
+
 
 class SearcherMusic:
     """
@@ -28,15 +30,19 @@ class SearcherMusic:
     - url: 按音乐地址（URL）搜索
     """
 
-    def __init__(self):
+    def __init__(self, hub: HttpHub):
         """初始化请求 URL 和请求头"""
+        self.hub = hub
         self.base_url = "https://music.txqq.pro/"
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36 Edg/132.0.0.0",
             "Accept": "application/json, text/javascript, */*; q=0.01",
             "X-Requested-With": "XMLHttpRequest",
         }
-        self.session = aiohttp.ClientSession()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self.hub.session
 
     async def fetch_data(self, song_name: str, platform_type: str, limit: int = 5):
         """
@@ -79,6 +85,3 @@ class SearcherMusic:
             return None
 
     # TODO: 完善
-
-    async def close(self):
-        await self.session.close()
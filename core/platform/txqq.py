@@ -1,9 +1,14 @@
+from dataclasses import replace
 from typing import ClassVar
 
+import aiohttp
+
 from astrbot.api import logger
 
+from ..cache import CacheHub
 from ..config import PluginConfig
 from ..model import Platform, Song
+from ..net import HttpHub, current_retry_policy, retry_policy
 from .base import BaseMusicPlayer
 
 """
@@ -82,11 +87,21 @@ class TXQQMusic(BaseMusicPlayer):
         "Origin": "https://music.txqq.pro",
         "Referer": "https://music.txqq.pro",
     }
+    # 搜索结果内联了每首歌的歌词，响应体较大，读取超时放宽一些
+    TIMEOUT = aiohttp.ClientTimeout(sock_connect=5, sock_read=15)
+    # 会重试的请求总超时受重试预算限制，搜索的预算至少要容得下一次完整读取
+    SEARCH_BUDGET = 20.0
 
-    def __init__(self, config: PluginConfig):
-        super().__init__(config)
+    def __init__(self, config: PluginConfig, hub: HttpHub, caches: CacheHub):
+        super().__init__(config, hub, caches)
         self.search_platform: str = "qq"
 
+    def upstreams(self) -> list[str]:
+        return [self.BASE_URL, *super().upstreams()]
+
+    def search_scope(self, extra: str | None) -> str:
+        return self._detect_platform(extra) if extra else self.search_platform
+
     def _detect_platform(self, keyword: str) -> str:
         """
         从 keyword 中自动识别平台
@@ -109,18 +124,22 @@ class TXQQMusic(BaseMusicPlayer):
         """
         获取歌曲数据
         """
-        platform_type = self._detect_platform(extra) if extra else self.search_platform
-        result = await self._request(
-            url=self.BASE_URL,
-            method="POST",
-            data={
-                "input": keyword,
-                "filter": "name",
-                "type": platform_type,
-                "page": 1,
-            },
-            headers=self.HEADERS,
-        )
+        platform_type = self.search_scope(extra)
+        policy = current_retry_policy()
+        budget = max(policy.budget, self.SEARCH_BUDGET)
+        with retry_policy(replace(policy, budget=budget)):
+            result = await self._request(
+                url=self.BASE_URL,
+                method="POST",
+                data={
+                    "input": keyword,
+                    "filter": "name",
+                    "type": platform_type,
+                    "page": 1,
+                },
+                headers=self.HEADERS,
+                idempotent=True,
+            )
         if not isinstance(result, dict) or "data" not in result:
             logger.error(f"返回了意料之外的数据：{result}")
             return []
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from astrbot.api import logger
+
+from .cache import KEY_PREFIX, MISSING, RedisError, TTLCache
+
+ForwardHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+SHARED_TTL = 24 * 3600
+""" Redis 中选歌状态的保留时间（秒），按钮选歌不受 timeout 限制，旧卡片仍可点击 """
+
+
+class SelectionStore:
+    """
+    选歌状态存储（进程内实现）
+    - 会话键 → 当前选歌 ID、选歌消息 ID
+    - 选歌 ID → 发起节点、是否已被认领
+    事件对象、播放器等不可序列化的上下文仍由发起节点自己保存
+    进程内的状态默认不过期（按钮选歌可以一直点击），只按条目数淘汰最旧的
+    """
+
+    MAX_ENTRIES = 10000
+
+    def __init__(self, ttl: float | None = None):
+        self.ttl = ttl
+        # 本节点的标识，用于把按钮点击转交回发起节点
+        self.node = uuid.uuid4().hex
+        self._current = TTLCache(self.MAX_ENTRIES, ttl=ttl)
+        self._messages = TTLCache(self.MAX_ENTRIES, ttl=ttl)
+        self._owners = TTLCache(self.MAX_ENTRIES, ttl=ttl)
+        self._claimed = TTLCache(self.MAX_ENTRIES, ttl=ttl)
+
+    async def bind(self, key: str, selection_id: str) -> None:
+        """把选歌设为会话的当前选歌，并记录发起节点"""
+        self._current.set(key, selection_id)
+        self._owners.set(selection_id, self.node)
+
+    async def current(self, key: str) -> str | None:
+        return self._current.get(key, None, count=False)
+
+    async def owner(self, selection_id: str) -> str | None:
+        return self._owners.get(selection_id, None, count=False)
+
+    async def claim(self, selection_id: str) -> bool:
+        """认领一次选歌，同一选歌只有第一次认领成功"""
+        if self._claimed.get(selection_id, count=False) is not MISSING:
+            return False
+        self._claimed.set(selection_id, True)
+        return True
+
+    async def unbind(self, key: str) -> str | None:
+        """结束会话的当前选歌，返回其选歌 ID"""
+        return self._current.pop(key)
+
+    async def set_message(self, key: str, message_id: str | int) -> None:
+        self._messages.set(key, str(message_id))
+
+    async def pop_message(self, key: str) -> str | None:
+        return self._messages.pop(key)
+
+    async def forward(self, node: str, payload: dict[str, Any]) -> bool:
+        """把按钮点击转交给发起节点，单进程下没有其他节点"""
+        return False
+
+    def start(self, handler: ForwardHandler) -> None:
+        """开始接收其他节点转交来的点击"""
+
+    async def stop(self) -> None:
+        pass
+
+
+class RedisSelectionStore(SelectionStore):
+    """
+    基于 Redis 协议的共享选歌状态
+    按钮点击被路由到其他节点时，由该节点通过发布订阅转交给发起节点处理
+    """
+
+    RECONNECT_DELAY = 5.0
+
+    def __init__(self, client: Any, ttl: float = SHARED_TTL):
+        super().__init__(ttl)
+        self._px = int(ttl * 1000)
+        self.client = client
+        self.prefix = f"{KEY_PREFIX}selection:"
+        self._task: asyncio.Task | None = None
+
+    def _channel(self, node: str) -> str:
+        return f"{self.prefix}forward:{node}"
+
+    async def _get(self, name: str) -> str | None:
+        try:
+            value = await self.client.get(self.prefix + name)
+        except RedisError as e:
+            logger.warning(f"读取选歌状态失败: {e}")
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def _pop(self, name: str) -> str | None:
+        value = await self._get(name)
+        if value is not None:
+            try:
+                await self.client.delete(self.prefix + name)
+            except RedisError as e:
+                logger.warning(f"删除选歌状态失败: {e}")
+        return value
+
+    async def bind(self, key: str, selection_id: str) -> None:
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(f"{self.prefix}current:{key}", selection_id, px=self._px)
+                pipe.set(f"{self.prefix}owner:{selection_id}", self.node, px=self._px)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"写入选歌状态失败: {e}")
+
+    async def current(self, key: str) -> str | None:
+        return await self._get(f"current:{key}")
+
+    async def owner(self, selection_id: str) -> str | None:
+        return await self._get(f"owner:{selection_id}")
+
+    async def claim(self, selection_id: str) -> bool:
+        try:
+            claimed = await self.client.set(
+                f"{self.prefix}claimed:{selection_id}",
+                self.node,
+                nx=True,
+                px=self._px,
+            )
+        except RedisError as e:
+            logger.warning(f"认领选歌失败: {e}")
+            return False
+        return bool(claimed)
+
+    async def unbind(self, key: str) -> str | None:
+        return await self._pop(f"current:{key}")
+
+    async def set_message(self, key: str, message_id: str | int) -> None:
+        try:
+            await self.client.set(
+                f"{self.prefix}message:{key}", str(message_id), px=self._px
+            )
+        except RedisError as e:
+            logger.warning(f"写入选歌消息 ID 失败: {e}")
+
+    async def pop_message(self, key: str) -> str | None:
+        return await self._pop(f"message:{key}")
+
+    async def forward(self, node: str, payload: dict[str, Any]) -> bool:
+        try:
+            receivers = await self.client.publish(
+                self._channel(node), json.dumps(payload, ensure_ascii=False)
+            )
+        except RedisError as e:
+            logger.warning(f"转交选歌点击失败: {e}")
+            return False
+        return bool(receivers)
+
+    def start(self, handler: ForwardHandler) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(handler))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _listen(self, handler: ForwardHandler) -> None:
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(self._channel(self.node))
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        try:
+                            payload = json.loads(message["data"])
+                        except (json.JSONDecodeError, TypeError):
+                            continue
+                        if isinstance(payload, dict):
+                            await handler(payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"选歌转交订阅中断，稍后重连: {e}")
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+
+def open_selection_store(redis: Any | None) -> SelectionStore:
+    """连接了 Redis 时使用共享状态，否则退回进程内状态"""
+    if redis is None:
+        return SelectionStore()
+    return RedisSelectionStore(redis)
@@ -3,7 +3,8 @@ import base64
 import json
 import random
 import uuid
-from io import BytesIO
+from collections.abc import Awaitable, Callable
+from pathlib import Path
 from typing import Any
 
 import botpy.message
@@ -35,16 +36,25 @@ from astrbot.core.platform.sources.qqofficial.qqofficial_platform_adapter import
 )
 from astrbot.core.star.context import Context
 
+from .cache import CacheHub
 from .config import PluginConfig
 from .cz_card import CZCard
 from .downloader import Downloader
 from .lyrics_renderer import LyricsRenderer
 from .model import Song
+from .net import HttpHub
 from .platform import BaseMusicPlayer, TXQQMusic
+from .selection import SelectionStore
 from .song_renderer import CardRenderer
+from .utils import is_url
+from .warmer import ActivityMonitor
 
 
 class MusicSender:
+    # OneBot 媒体链接带的 rkey 约一小时失效，失效后发送不会报错、只会发出裂图，
+    # 所以只在 rkey 有效期的前一半复用（秒）
+    ONEBOT_LINK_TTL = 1800.0
+
     def __init__(
         self,
         config: PluginConfig,
@@ -52,23 +62,25 @@ class MusicSender:
         lyrics_renderer: LyricsRenderer,
         downloader: Downloader,
         song_renderer: CardRenderer,
+        hub: HttpHub,
+        caches: CacheHub,
+        selections: SelectionStore,
+        activity: ActivityMonitor,
     ):
         self.cfg = config
         self.context = context
         self.lyrics_renderer = lyrics_renderer
         self.downloader = downloader
         self.song_renderer = song_renderer
-        self.cz_card = CZCard(config)
-        self._selection_message_ids: dict[str, str | int] = {}
+        self.caches = caches
+        self.cz_card = CZCard(config, hub, caches.cz)
+        self.selections = selections
+        self.activity = activity
+        # 选歌上下文含事件对象，只保存在发起选歌的节点上
         self._selection_contexts: dict[str, dict[str, Any]] = {}
-        self._selection_context_ids: dict[str, str] = {}
         self._interaction_clients: set[int] = set()
         self.interaction_created: bool = False
 
-    async def close(self) -> None:
-        """Release resources owned by the sender."""
-        await self.cz_card.close()
-
     def set_interaction_create(self):
         if self.interaction_created:
             return
@@ -150,20 +162,20 @@ class MusicSender:
     def _make_selection_key(event: AstrMessageEvent) -> str:
         return f"{event.unified_msg_origin}:{event.get_sender_id()}"
 
-    def clear_selection_context(self, event: AstrMessageEvent) -> None:
+    async def clear_selection_context(self, event: AstrMessageEvent) -> None:
         """Remove the active selection context for an event.
 
         Args:
             event: The event whose song selection has finished.
         """
         selection_key = self._make_selection_key(event)
-        selection_id = self._selection_context_ids.pop(selection_key, None)
+        selection_id = await self.selections.unbind(selection_key)
         if selection_id:
             self._selection_contexts.pop(selection_id, None)
 
     async def _recall_selection_message(self, event: AstrMessageEvent) -> None:
         key = self._make_selection_key(event)
-        message_id = self._selection_message_ids.pop(key, None)
+        message_id = await self.selections.pop_message(key)
         if message_id is None:
             return
 
@@ -194,20 +206,40 @@ class MusicSender:
             index = int(payload.get("index"))  # type: ignore
         except (TypeError, ValueError):
             return True
-        context = self._selection_contexts.get(selection_id)
-        if context is None or context.get("handled"):
+        if selection_id not in self._selection_contexts:
+            # 选歌由其他节点发起，转交给发起节点处理
+            owner = await self.selections.owner(selection_id)
+            if owner and owner != self.selections.node:
+                await self.selections.forward(
+                    owner, {"selection_id": selection_id, "index": index}
+                )
             return True
+        await self.handle_selection_click(selection_id, index)
+        return True
+
+    async def handle_selection_click(self, selection_id: str, index: int) -> None:
+        """Send the song picked from a button selection started on this node.
+
+        Args:
+            selection_id: Selection the clicked button belongs to.
+            index: 1-based index of the chosen song.
+        """
+        context = self._selection_contexts.get(selection_id)
+        if context is None:
+            return
+        self.activity.touch()
 
         event = context["event"]
         selection_key = self._make_selection_key(event)
-        if self._selection_context_ids.get(selection_key) != selection_id:
-            return True
+        if await self.selections.current(selection_key) != selection_id:
+            return
+        if not await self.selections.claim(selection_id):
+            return
 
-        context["handled"] = True
         songs = context["songs"]
         if index < 1 or index > len(songs):
-            return True
-        self.clear_selection_context(event)
+            return
+        await self.clear_selection_context(event)
         asyncio.create_task(
             self.send_song(
                 event,
@@ -215,22 +247,34 @@ class MusicSender:
                 songs[index - 1],
             )
         )
-        return True
+
+    async def on_forwarded_click(self, payload: dict[str, Any]) -> None:
+        """Handle a button click another node forwarded to this one."""
+        try:
+            index = int(payload.get("index"))  # type: ignore
+        except (TypeError, ValueError):
+            return
+        await self.handle_selection_click(str(payload.get("selection_id")), index)
 
     async def _build_cover_map(
         self, cover_urls: list[str]
     ) -> dict[str, PILImage.Image]:
-        cover_map: dict[str, PILImage.Image] = {}
-        for cover_url in dict.fromkeys(cover_urls):
+        theme = self.song_renderer.theme
+        size = (theme.card_width, theme.thumb_height)
+
+        async def fetch(url: str) -> bytes | None:
+            return await self.downloader.download_image(url, close_ssl=False)
+
+        async def load(url: str) -> PILImage.Image | None:
             try:
-                data = await self.downloader.download_image(cover_url, close_ssl=False)
-                if not data:
-                    continue
-                image = PILImage.open(BytesIO(data)).convert("RGB")
-                cover_map[cover_url] = image
+                return await self.caches.covers.get(url, size, fetch)
             except Exception as e:
-                logger.warning(f"封面下载失败: {cover_url}, {e}")
-        return cover_map
+                logger.warning(f"封面下载失败: {url}, {e}")
+                return None
+
+        urls = list(dict.fromkeys(cover_urls))
+        images = await asyncio.gather(*(load(url) for url in urls))
+        return {url: image for url, image in zip(urls, images) if image is not None}
 
     @staticmethod
     async def send_msg(event: AiocqhttpMessageEvent, payloads: dict) -> int | None:
@@ -242,6 +286,196 @@ class MusicSender:
             result = await event.bot.api.call_action("send_group_msg", **payloads)
         return result.get("message_id")
 
+    async def _send_onebot_media(
+        self,
+        event: AiocqhttpMessageEvent,
+        kind: str,
+        digest: str,
+        load_segment: Callable[[], Awaitable[dict[str, Any]]],
+        **extra: Any,
+    ) -> int | None:
+        """Send a OneBot media segment, reusing a known link for the same bytes.
+
+        After a fresh upload the sent message is read back with ``get_msg``
+        and the media link it carries is remembered for later sends. The
+        link's ``rkey`` expires without the send failing, so links are only
+        reused for ``ONEBOT_LINK_TTL`` seconds.
+
+        Args:
+            event: The event to reply to.
+            kind: The OneBot segment type (``image``, ``record`` or ``file``).
+            digest: The content digest of the media.
+            load_segment: Builds the segment that uploads the content.
+            **extra: Extra segment data kept when sending by link.
+
+        Returns:
+            The message ID reported by the OneBot implementation.
+        """
+        handles = self.caches.media
+        # OneBot 返回的媒体链接不限会话，同一适配器下共用
+        key = handles.make_key(event.get_platform_name(), "", kind, digest)
+        if (handle := await handles.get(key)) is not None:
+            payloads = {"message": [{"type": kind, "data": {**extra, **handle}}]}
+            try:
+                return await self.send_msg(event, payloads)
+            except Exception as e:
+                logger.warning(f"复用已上传的媒体失败，重新上传: {e}")
+                await handles.delete(key)
+
+        message_id = await self.send_msg(event, {"message": [await load_segment()]})
+        if message_id is not None:
+            try:
+                result = await event.bot.api.call_action(
+                    "get_msg", message_id=message_id
+                )
+            except Exception as e:
+                logger.debug(f"读取已发送的媒体消息失败: {e}")
+                return message_id
+            for seg in (result or {}).get("message") or []:
+                if isinstance(seg, dict) and seg.get("type") == kind:
+                    url = (seg.get("data") or {}).get("url")
+                    if isinstance(url, str) and is_url(url):
+                        await handles.put(
+                            key, {"file": url}, self.ONEBOT_LINK_TTL
+                        )
+                    break
+        return message_id
+
+    async def _send_qqofficial_media(
+        self, event: QQOfficialMessageEvent, file_type: int, digest: str, data: bytes
+    ) -> str | None:
+        """Send rich media through the QQ v2 files API, reusing ``file_info``.
+
+        Uploaded files can be referenced again within the same group or
+        private chat until the ``ttl`` returned by the upload expires.
+
+        Args:
+            event: The event to reply to; must come from a group or C2C chat.
+            file_type: The QQ rich media type (1 image, 2 video, 3 voice, 4 file).
+            digest: The content digest of the media.
+            data: The media bytes, uploaded only when no handle is cached.
+
+        Returns:
+            The message ID of the sent message.
+        """
+        source = event.message_obj.raw_message
+        if isinstance(source, botpy.message.GroupMessage):
+            scope = source.group_openid
+            route = Route(
+                "POST", "/v2/groups/{group_openid}/files", group_openid=scope
+            )
+        else:
+            scope = source.author.user_openid
+            route = Route("POST", "/v2/users/{openid}/files", openid=scope)
+
+        handles = self.caches.media
+        key = handles.make_key(event.get_platform_name(), scope, str(file_type), digest)
+        handle = await handles.get(key)
+        for reused in (handle is not None, False):
+            if not reused:
+                result = await event.bot.api._http.request(
+                    route,
+                    json={
+                        "file_type": file_type,
+                        "file_data": base64.b64encode(data).decode(),
+                        "srv_send_msg": False,
+                    },
+                )
+                handle = {"file_info": result["file_info"]}
+                # ttl 为 0 表示长期有效，交给配置的有效期
+                await handles.put(key, handle, result.get("ttl") or None)
+            try:
+                if isinstance(source, botpy.message.GroupMessage):
+                    sent = await event.bot.api.post_group_message(
+                        group_openid=scope,  # type: ignore
+                        msg_type=7,
+                        media=handle,  # type: ignore[arg-type]
+                        msg_id=source.id,
+                        msg_seq=random.randint(1, 10000),
+                    )
+                else:
+                    sent = await event.post_c2c_message(
+                        openid=scope,
+                        msg_type=7,
+                        media=handle,  # type: ignore[arg-type]
+                        msg_id=source.id,
+                        msg_seq=random.randint(1, 10000),
+                    )
+            except Exception as e:
+                if not reused:
+                    raise
+                logger.warning(f"复用已上传的媒体失败，重新上传: {e}")
+                await handles.delete(key)
+                continue
+            return (
+                sent.get("id") if isinstance(sent, dict) else getattr(sent, "id", None)
+            )
+        return None
+
+    async def _send_image(
+        self, event: AstrMessageEvent, image: bytes
+    ) -> str | int | None:
+        """Send an image, reusing the platform's handle for identical bytes.
+
+        Args:
+            event: The event to reply to.
+            image: The encoded image.
+
+        Returns:
+            The message ID when the platform reports one.
+        """
+        digest = self.caches.media.digest(image)
+        if isinstance(event, AiocqhttpMessageEvent):
+
+            async def segment() -> dict[str, Any]:
+                encoded = base64.b64encode(image).decode()
+                return {"type": "image", "data": {"file": f"base64://{encoded}"}}
+
+            return await self._send_onebot_media(event, "image", digest, segment)
+
+        if isinstance(event, QQOfficialMessageEvent):
+            source = event.message_obj.raw_message
+            if isinstance(
+                source, (botpy.message.GroupMessage, botpy.message.C2CMessage)
+            ):
+                return await self._send_qqofficial_media(event, 1, digest, image)
+            platform = getattr(event.bot, "platform", None)
+            if platform is not None:
+                await platform.send_by_session(
+                    event.session,
+                    MessageChain(chain=[Image.fromBytes(image)]),
+                )
+                return getattr(platform, "_session_last_message_id", {}).get(
+                    event.session_id
+                )
+
+        await event.send(MessageChain(chain=[Image.fromBytes(image)]))
+        return None
+
+    async def _send_local_media(
+        self, event: AstrMessageEvent, kind: str, seg: Record | File, file_path: Path
+    ) -> None:
+        """Send a downloaded record or file, reusing OneBot links when possible.
+
+        Args:
+            event: The event to reply to.
+            kind: The OneBot segment type (``record`` or ``file``).
+            seg: The AstrBot component that uploads the local file.
+            file_path: The local file, hashed to find a reusable link.
+        """
+        if not isinstance(event, AiocqhttpMessageEvent):
+            await event.send(event.chain_result([seg]))
+            return
+
+        digest = await asyncio.to_thread(self.caches.media.file_digest, file_path)
+
+        async def segment() -> dict[str, Any]:
+            chain = MessageChain(chain=[seg])
+            return (await AiocqhttpMessageEvent._parse_onebot_json(chain))[0]
+
+        extra = {"name": seg.name} if isinstance(seg, File) else {}
+        await self._send_onebot_media(event, kind, digest, segment, **extra)
+
     async def _send_song_selection_text(
         self,
         event: AstrMessageEvent,
@@ -273,7 +507,7 @@ class MusicSender:
 
         if message_id is not None:
             key = self._make_selection_key(event)
-            self._selection_message_ids[key] = message_id
+            await self.selections.set_message(key, message_id)
         return message_id
 
     async def _send_song_selection_button(
@@ -284,14 +518,12 @@ class MusicSender:
     ) -> str | None:
         self.set_interaction_create()
         selection_id = uuid.uuid4().hex
-        selection_context = {
+        self._selection_contexts[selection_id] = {
             "event": event,
             "songs": songs,
             "player": player,
-            "handled": False,
         }
-        self._selection_contexts[selection_id] = selection_context
-        self._selection_context_ids[self._make_selection_key(event)] = selection_id
+        await self.selections.bind(self._make_selection_key(event), selection_id)
 
         buttons = []
         for index, song in enumerate(songs, 1):
@@ -373,7 +605,7 @@ class MusicSender:
         if message_id is None:
             raise RuntimeError("QQ API response has no message ID")
         key = self._make_selection_key(event)
-        self._selection_message_ids[key] = message_id
+        await self.selections.set_message(key, message_id)
         return str(message_id)
 
     async def _send_song_selection_image(
@@ -382,6 +614,36 @@ class MusicSender:
         songs: list[Song],
         player: BaseMusicPlayer | None = None,
     ) -> str | int | None:
+        images = self.caches.selection_images
+        key = images.make_key(self.song_renderer.song_list_fingerprint(songs))
+        image_bytes = await images.get(key)
+        if image_bytes is None:
+            image_bytes = await self._render_song_selection_image(songs, player, key)
+
+        message_id = await self._send_image(event, image_bytes)
+
+        if message_id is not None:
+            key = self._make_selection_key(event)
+            await self.selections.set_message(key, message_id)
+        return message_id
+
+    async def _render_song_selection_image(
+        self, songs: list[Song], player: BaseMusicPlayer | None, key: str
+    ) -> bytes:
+        """Enrich, render and memoize a selection image.
+
+        The image is stored under the fingerprint of the songs as they were
+        before enrichment and, when enrichment changed any displayed field,
+        under the enriched fingerprint as well.
+
+        Args:
+            songs: The search results to render.
+            player: The player used to fill in missing covers.
+            key: The cache key of the un-enriched songs.
+
+        Returns:
+            The encoded JPEG.
+        """
         song_items = []
         cover_urls: list[str] = []
         for song in songs:
@@ -395,40 +657,14 @@ class MusicSender:
         image_bytes = await self.song_renderer.render_song_list_image(
             song_items, cover_map
         )
-
-        if isinstance(event, AiocqhttpMessageEvent):
-            payloads = {
-                "message": [
-                    {
-                        "type": "image",
-                        "data": {
-                            "file": f"base64://{base64.b64encode(image_bytes).decode()}",
-                        },
-                    }
-                ]
-            }
-            message_id = await self.send_msg(event, payloads)
-        elif isinstance(event, QQOfficialMessageEvent):
-            platform = getattr(event.bot, "platform", None)
-            if platform is not None:
-                await platform.send_by_session(
-                    event.session,
-                    MessageChain(chain=[Image.fromBytes(image_bytes)]),
-                )
-                message_id = getattr(platform, "_session_last_message_id", {}).get(
-                    event.session_id
-                )
-            else:
-                await event.send(MessageChain(chain=[Image.fromBytes(image_bytes)]))
-                message_id = None
-        else:
-            await event.send(MessageChain(chain=[Image.fromBytes(image_bytes)]))
-            message_id = None
-
-        if message_id is not None:
-            key = self._make_selection_key(event)
-            self._selection_message_ids[key] = message_id
-        return message_id
+        # 有封面没能加载时卡片是占位图，不缓存，下次再试
+        if all(url in cover_map for url in cover_urls):
+            images = self.caches.selection_images
+            await images.put(key, image_bytes)
+            fingerprint = self.song_renderer.song_list_fingerprint(song_items)
+            if (enriched := images.make_key(fingerprint)) != key:
+                await images.put(enriched, image_bytes)
+        return image_bytes
 
     async def send_song_selection(
         self,
@@ -544,7 +780,7 @@ class MusicSender:
 
         try:
             seg = Record.fromFileSystem(str(file_path.resolve()))
-            await event.send(event.chain_result([seg]))
+            await self._send_local_media(event, "record", seg, file_path)
             return True
         except Exception as e:
             logger.error(f"Local voice send failed: {e}")
@@ -578,7 +814,7 @@ class MusicSender:
         try:
             file_name = f"{song.name}_{song.artists}{file_path.suffix}"
             seg = File(name=file_name, file=str(file_path.resolve()))
-            await event.send(event.chain_result([seg]))
+            await self._send_local_media(event, "file", seg, file_path)
             return True
         except Exception as e:
             logger.error(f"Local file send failed: {e}")
@@ -607,7 +843,7 @@ class MusicSender:
             # 没有评论
             return False
         try:
-            content = random.choice(song.comments).get("content")
+            content = random.choice(song.comments).content
             await event.send(event.plain_result(content))
             return True
         except Exception:
@@ -625,8 +861,8 @@ class MusicSender:
             logger.error(f"【{song.name}】歌词获取失败")
             return False
         try:
-            image = self.lyrics_renderer.draw_lyrics(song.lyrics)
-            await event.send(MessageChain(chain=[Image.fromBytes(image)]))
+            image = await self.lyrics_renderer.render(song.lyrics)
+            await self._send_image(event, image)
             return True
         except Exception as e:
             logger.error(f"【{song.name}】歌词渲染/发送失败: {e}")
@@ -706,7 +942,7 @@ class MusicSender:
             await event.send(event.plain_result("歌曲发送失败"))
             return
 
-        self.clear_selection_context(event)
+        await self.clear_selection_context(event)
         if self.cfg.recall_select:
             await self._recall_selection_message(event)
 
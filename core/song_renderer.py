@@ -6,6 +6,7 @@ from PIL import Image, ImageDraw, ImageFont
 
 from astrbot import logger
 
+from .cache import TileCache
 from .config import PluginConfig
 from .model import Song
 
@@ -28,16 +29,24 @@ class CardTheme:
     def load_font(self, font_path: str) -> ImageFont.FreeTypeFont:
         return ImageFont.truetype(font_path, self.font_size)
 
+    def fingerprint(self) -> tuple:
+        """主题参数的指纹，用作渲染缓存键的一部分"""
+        return tuple(getattr(self, name) for name in CardTheme.__annotations__)
+
 
 class CardRenderer:
     def __init__(
         self,
         config: PluginConfig,
         theme: CardTheme | None = None,
+        tiles: TileCache | None = None,
     ):
         self.cfg = config
         self.theme = theme or CardTheme()
         self.font = self.theme.load_font(str(self.cfg.font_path))
+        self.tiles = tiles
+        self._theme_key = (self.theme.fingerprint(), str(self.cfg.font_path))
+        self._mask = self._build_mask()
 
     def format_count(self, count: int) -> str:
         if count >= 10000:
@@ -54,99 +63,15 @@ class CardRenderer:
     ) -> Image.Image:
         try:
             theme = self.theme
-            font = self.font
-
-            card = Image.new(
-                "RGBA",
-                (theme.card_width, theme.card_height),
-                theme.card_bg,
-            )
+            card = self._get_tile(media, cover_map).copy()
             draw = ImageDraw.Draw(card)
-
-            raw_url = str(media.get("cover") or media.get("pic") or "")
-
-            pic_url = raw_url
-            thumb = cover_map.get(pic_url) or Image.new(
-                "RGB",
-                (theme.card_width, theme.thumb_height),
-                "#e5e5e5",
-            )
-            thumb = thumb.resize((theme.card_width, theme.thumb_height))
-            card.paste(thumb, (0, 0))
-
-            alpha_gradient = Image.new(
-                "L",
-                (theme.card_width, theme.gradient_height),
-                color=0,
-            )
-            gradient_draw = ImageDraw.Draw(alpha_gradient)
-            for y in range(theme.gradient_height):
-                alpha = int(theme.gradient_max_alpha * (y / theme.gradient_height))
-                gradient_draw.line([(0, y), (theme.card_width, y)], fill=alpha)
-
-            overlay = Image.new(
-                "RGBA",
-                (theme.card_width, theme.gradient_height),
-                color=(0, 0, 0, 255),
-            )
-            overlay.putalpha(alpha_gradient)
-            card.paste(
-                overlay,
-                (0, theme.thumb_height - theme.gradient_height),
-                overlay,
-            )
-
-            draw.text(
-                (8, theme.thumb_height - 20),
-                self.format_count(int(media.get("play", 0) or 0)),
-                font=font,
-                fill=theme.overlay_text_color,
-            )
-            draw.text(
-                (theme.card_width - 40, theme.thumb_height - 20),
-                str(media.get("duration") or "0:00"),
-                font=font,
-                fill=theme.overlay_text_color,
-            )
-
-            raw_title = BeautifulSoup(
-                str(media.get("title") or ""),
-                "html.parser",
-            ).get_text()
-            title = (
-                raw_title[:18] + "\n" + raw_title[18:36] + "..."
-                if len(raw_title) > 36
-                else raw_title[:18] + "\n" + raw_title[18:]
-            )
-            draw.text(
-                (8, theme.thumb_height + 8),
-                title,
-                font=font,
-                fill=theme.title_color,
-            )
-
-            draw.text(
-                (8, theme.card_height - 30),
-                self._build_author_text(media),
-                font=font,
-                fill=theme.sub_text_color,
-            )
-
             draw.text(
                 (theme.card_width - 20, theme.card_height - 25),
                 str(index),
-                font=font,
+                font=self.font,
                 fill=theme.sub_text_color,
             )
-
-            mask = Image.new("L", (theme.card_width, theme.card_height), 0)
-            mask_draw = ImageDraw.Draw(mask)
-            mask_draw.rounded_rectangle(
-                (0, 0, theme.card_width, theme.card_height),
-                radius=theme.corner_radius,
-                fill=255,
-            )
-            card.putalpha(mask)
+            card.putalpha(self._mask)
             return card
 
         except Exception as exc:
@@ -157,6 +82,120 @@ class CardRenderer:
                 self.theme.card_bg,
             )
 
+    def _get_tile(
+        self,
+        media: dict,
+        cover_map: dict[str, Image.Image],
+    ) -> Image.Image:
+        """
+        获取不含序号的卡片，优先复用缓存
+        封面缺失时画的是占位图，不写入缓存，免得下次封面可用时仍显示灰块
+        """
+        pic_url = str(media.get("cover") or media.get("pic") or "")
+        thumb = cover_map.get(pic_url)
+        title = str(media.get("title") or "")
+        author = self._build_author_text(media)
+        duration = str(media.get("duration") or "0:00")
+        play = self.format_count(int(media.get("play", 0) or 0))
+
+        key = None
+        if thumb is not None and self.tiles is not None:
+            key = self.tiles.make_key(
+                pic_url, title, author, duration, play, self._theme_key
+            )
+            if (tile := self.tiles.get(key)) is not None:
+                return tile
+
+        tile = self._draw_tile(thumb, title, author, duration, play)
+        if key is not None:
+            self.tiles.put(key, tile)
+        return tile
+
+    def _draw_tile(
+        self,
+        thumb: Image.Image | None,
+        raw_title: str,
+        author: str,
+        duration: str,
+        play: str,
+    ) -> Image.Image:
+        theme = self.theme
+        font = self.font
+
+        card = Image.new(
+            "RGBA",
+            (theme.card_width, theme.card_height),
+            theme.card_bg,
+        )
+        draw = ImageDraw.Draw(card)
+
+        thumb = thumb or Image.new(
+            "RGB",
+            (theme.card_width, theme.thumb_height),
+            "#e5e5e5",
+        )
+        if thumb.size != (theme.card_width, theme.thumb_height):
+            thumb = thumb.resize((theme.card_width, theme.thumb_height))
+        card.paste(thumb, (0, 0))
+
+        alpha_gradient = Image.new(
+            "L",
+            (theme.card_width, theme.gradient_height),
+            color=0,
+        )
+        gradient_draw = ImageDraw.Draw(alpha_gradient)
+        for y in range(theme.gradient_height):
+            alpha = int(theme.gradient_max_alpha * (y / theme.gradient_height))
+            gradient_draw.line([(0, y), (theme.card_width, y)], fill=alpha)
+
+        overlay = Image.new(
+            "RGBA",
+            (theme.card_width, theme.gradient_height),
+            color=(0, 0, 0, 255),
+        )
+        overlay.putalpha(alpha_gradient)
+        card.paste(
+            overlay,
+            (0, theme.thumb_height - theme.gradient_height),
+            overlay,
+        )
+
+        draw.text(
+            (8, theme.thumb_height - 20),
+            play,
+            font=font,
+            fill=theme.overlay_text_color,
+        )
+        draw.text(
+            (theme.card_width - 40, theme.thumb_height - 20),
+            duration,
+            font=font,
+            fill=theme.overlay_text_color,
+        )
+
+        raw_title = BeautifulSoup(raw_title, "html.parser").get_text()
+        title = (
+            raw_title[:18] + "\n" + raw_title[18:36] + "..."
+            if len(raw_title) > 36
+            else raw_title[:18] + "\n" + raw_title[18:]
+        )
+        draw.text(
+            (8, theme.thumb_height + 8),
+            title,
+            font=font,
+            fill=theme.title_color,
+        )
+
+        draw.text(
+            (8, theme.card_height - 30),
+            author,
+            font=font,
+            fill=theme.sub_text_color,
+        )
+
+        card.putalpha(self._mask)
+        return card
+
     async def render_list_image(
         self,
         media_list: list,
@@ -206,26 +245,59 @@ class CardRenderer:
         final_image.save(buffer, format="JPEG", quality=jpeg_quality)
         return buffer.getvalue()
 
+    def song_list_fingerprint(self, songs: list[Song], jpeg_quality: int = 80) -> tuple:
+        """选歌图片的指纹：歌曲顺序与展示字段、每行卡片数、主题，决定渲染结果"""
+        return (
+            self._theme_key,
+            self.cfg.cards_per_row,
+            jpeg_quality,
+            tuple(
+                (
+                    song.source,
+                    song.id,
+                    song.cover_url,
+                    song.name,
+                    song.artists,
+                    self._format_duration(song.duration),
+                )
+                for song in songs
+            ),
+        )
+
     async def render_song_list_image(
         self,
         songs: list[Song],
         cover_map: dict[str, Image.Image],
         jpeg_quality: int = 80,
     ) -> bytes:
-        media_list = [
-            {
-                "cover": song.cover_url,
-                "title": song.name,
-                "author": song.artists,
-                "duration": self._format_duration(song.duration),
-                "play": 0,
-            }
-            for song in songs
-        ]
+        media_list = [self._song_media(song) for song in songs]
         return await self.render_list_image(
             media_list, cover_map, jpeg_quality=jpeg_quality
         )
 
+    def warm_tile(self, song: Song, cover_map: dict[str, Image.Image]) -> None:
+        """预先渲染歌曲卡片并写入缓存，之后的选歌图片只需补上序号"""
+        self._get_tile(self._song_media(song), cover_map)
+
+    def _song_media(self, song: Song) -> dict:
+        return {
+            "cover": song.cover_url,
+            "title": song.name,
+            "author": song.artists,
+            "duration": self._format_duration(song.duration),
+            "play": 0,
+        }
+
+    def _build_mask(self) -> Image.Image:
+        theme = self.theme
+        mask = Image.new("L", (theme.card_width, theme.card_height), 0)
+        ImageDraw.Draw(mask).rounded_rectangle(
+            (0, 0, theme.card_width, theme.card_height),
+            radius=theme.corner_radius,
+            fill=255,
+        )
+        return mask
+
     @staticmethod
     def _build_author_text(media: dict) -> str:
         return str(media.get("author") or "").strip() or "-"
@@ -1,3 +1,5 @@
+import re
+import unicodedata
 from enum import IntEnum
 
 
@@ -89,3 +91,18 @@ def parse_user_input(arg: str) -> tuple[int, list[str] | None, str | None]:
                 )
     modes = mode_map.get(way) if way else None
     return index, modes, None
+
+
+def is_url(text: str | None) -> bool:
+    """Whether ``text`` is an http(s) URL rather than inline content."""
+    return isinstance(text, str) and text.strip().startswith(("http://", "https://"))
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Normalize a search keyword so equivalent queries share one key.
+
+    Full-width characters are folded to half-width (NFKC), case is folded
+    and runs of whitespace collapse to a single space.
+    """
+    keyword = unicodedata.normalize("NFKC", keyword).casefold()
+    return re.sub(r"\s+", " ", keyword).strip()
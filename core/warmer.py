@@ -0,0 +1,179 @@
+"""空闲时预热热门榜单"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Awaitable, Callable
+
+from astrbot.api import logger
+
+from .cache import CacheHub
+from .config import PluginConfig
+from .downloader import Downloader
+from .model import Song
+from .net import BACKGROUND_RETRY, retry_policy
+from .platform import BaseMusicPlayer
+from .song_renderer import CardRenderer
+
+_Step = tuple[
+    Callable[[Song], bool | Awaitable[bool]], Callable[[Song], Awaitable[Song]]
+]
+""" (是否需要这一步, 补全调用)，判断可以是异步的（如查封面缓存） """
+
+
+class ActivityMonitor:
+    """记录最近一次用户请求的时间，后台任务据此判断是否空闲"""
+
+    def __init__(self):
+        self.last = float("-inf")
+
+    def touch(self) -> None:
+        """有用户请求到来"""
+        self.last = time.monotonic()
+
+    def idle_for(self) -> float:
+        return time.monotonic() - self.last
+
+    async def wait_idle(self, seconds: float) -> None:
+        """等到距最近一次用户请求超过 seconds 秒"""
+        while (remaining := seconds - self.idle_for()) > 0:
+            await asyncio.sleep(remaining)
+
+
+class ChartWarmer:
+    """
+    空闲时拉取各平台的热门榜单，提前填充歌曲信息、封面、歌词、热评和卡片缓存
+    - 每次上游请求前都先等到空闲，有用户请求时下一次请求立即让路
+    - 每轮的上游请求数受 budget 限制，歌曲身份映射里已有的字段不再请求
+    """
+
+    def __init__(
+        self,
+        config: PluginConfig,
+        players: list[BaseMusicPlayer],
+        caches: CacheHub,
+        downloader: Downloader,
+        song_renderer: CardRenderer,
+        activity: ActivityMonitor,
+    ):
+        self.cfg = config
+        self.players = players
+        self.caches = caches
+        self.downloader = downloader
+        self.song_renderer = song_renderer
+        self.activity = activity
+        self._remaining = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.cfg.warmer.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                used = await self.warm()
+                logger.debug(f"热门榜单预热完成，发出 {used} 个请求")
+            except Exception as e:
+                logger.warning(f"热门榜单预热失败: {e}")
+            await asyncio.sleep(self.cfg.warmer.interval)
+
+    async def warm(self) -> int:
+        """预热一轮，返回计入预算的请求数"""
+        cfg = self.cfg.warmer
+        self._remaining = cfg.budget
+        # 只有覆盖了 fetch_charts 的平台才有榜单可拉
+        players = [
+            p
+            for p in self.players
+            if type(p).fetch_charts is not BaseMusicPlayer.fetch_charts
+        ]
+        with retry_policy(BACKGROUND_RETRY):
+            for player in players:
+                if self._remaining < 1 + cfg.lists:
+                    break
+                await self.activity.wait_idle(cfg.idle_seconds)
+                self._remaining -= 1 + cfg.lists
+                songs = await player.fetch_charts(cfg.lists, cfg.songs_per_list)
+                songs = self.caches.songs.reconcile(player.platform.name, songs)
+                for song in songs:
+                    if not await self._warm_song(player, song):
+                        break
+        return cfg.budget - self._remaining
+
+    async def _warm_song(self, player: BaseMusicPlayer, song: Song) -> bool:
+        """依次补全一首歌的各项缓存，预算用完时返回 False"""
+        cfg = self.cfg
+        # 前一步可能已补上后一步的字段（如 meting 顺带返回歌词），条件逐步判断
+        steps: list[_Step] = [
+            (lambda s: not s.cover_url or not s.audio_url, player.fetch_extra),
+            (self._cover_missing, self._warm_cover),
+            (lambda s: self._lyrics_missing(player, s), player.fetch_lyrics),
+            (lambda s: cfg.enable_comments and not s.comments, player.fetch_comments),
+        ]
+        for need, call in steps:
+            wanted = need(song)
+            if inspect.isawaitable(wanted):
+                wanted = await wanted
+            if not wanted:
+                continue
+            if self._remaining <= 0:
+                return False
+            await self.activity.wait_idle(cfg.warmer.idle_seconds)
+            self._remaining -= 1
+            try:
+                song = await call(song) or song
+            except Exception as e:
+                logger.debug(f"预热【{song.name}】失败: {e}")
+        return True
+
+    @property
+    def _cover_size(self) -> tuple[int, int]:
+        theme = self.song_renderer.theme
+        return (theme.card_width, theme.thumb_height)
+
+    async def _cover_missing(self, song: Song) -> bool:
+        """
+        封面缩略图是否还需下载
+        已缓存时只渲染选歌卡片，不发请求，也不占预算
+        """
+        if not song.cover_url:
+            return False
+        thumb = await self.caches.covers.peek(song.cover_url, self._cover_size)
+        if thumb is None:
+            return True
+        self.song_renderer.warm_tile(song, {song.cover_url: thumb})
+        return False
+
+    async def _lyrics_missing(self, player: BaseMusicPlayer, song: Song) -> bool:
+        """
+        歌词是否还需请求
+        歌词库里已有时直接带上，不发请求，也不占预算
+        """
+        if not self.cfg.enable_lyrics or song.lyrics:
+            return False
+        store = self.caches.lyrics
+        key = store.make_key(song.source or player.platform.name, song.id)
+        if lyrics := await store.get(key):
+            song.lyrics = lyrics
+            return False
+        return True
+
+    async def _warm_cover(self, song: Song) -> Song:
+        """下载并缓存封面缩略图，再渲染选歌卡片"""
+        if not song.cover_url:
+            return song
+
+        async def fetch(url: str) -> bytes | None:
+            return await self.downloader.download_image(url, close_ssl=False)
+
+        thumb = await self.caches.covers.get(song.cover_url, self._cover_size, fetch)
+        if thumb is not None:
+            self.song_renderer.warm_tile(song, {song.cover_url: thumb})
+        return song
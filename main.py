@@ -1,3 +1,4 @@
+import asyncio
 import traceback
 
 from astrbot.api import logger
@@ -9,13 +10,18 @@ from astrbot.core.utils.session_waiter import (
     session_waiter,
 )
 
+from .core.cache import CacheHub
 from .core.config import PluginConfig
 from .core.downloader import Downloader
+from .core.health import HealthProber, Scoreboard
 from .core.lyrics_renderer import LyricsRenderer
+from .core.net import HttpHub
 from .core.platform import BaseMusicPlayer
+from .core.selection import open_selection_store
 from .core.sender import MusicSender
 from .core.song_renderer import CardRenderer
 from .core.utils import parse_user_input
+from .core.warmer import ActivityMonitor, ChartWarmer
 
 
 class MusicPlugin(Star):
@@ -23,33 +29,80 @@ class MusicPlugin(Star):
         super().__init__(context)
         self.context = context
         self.cfg = PluginConfig(config, context)
-        self.lyrics_renderer = LyricsRenderer(self.cfg)
-        self.song_renderer = CardRenderer(self.cfg)
-        self.downloader = Downloader(self.cfg)
+        self.hub = HttpHub(self.cfg)
+        self.caches = CacheHub(self.cfg)
+        self.selections = open_selection_store(self.caches.redis)
+        self.lyrics_renderer = LyricsRenderer(
+            self.cfg, images=self.caches.lyric_images
+        )
+        self.song_renderer = CardRenderer(self.cfg, tiles=self.caches.tiles)
+        self.downloader = Downloader(self.cfg, self.hub)
+        # 用户请求的活跃度，后台预热据此让路
+        self.activity = ActivityMonitor()
         self.sender = MusicSender(
             self.cfg,
             self.context,
             self.lyrics_renderer,
             self.downloader,
             self.song_renderer,
+            self.hub,
+            self.caches,
+            self.selections,
+            self.activity,
         )
         self.players: list[BaseMusicPlayer] = []
         self.keywords: list[str] = []
+        self.scoreboard = Scoreboard()
+        self.prober = HealthProber(self.cfg, self.players, self.scoreboard)
+        self.warmer = ChartWarmer(
+            self.cfg,
+            self.players,
+            self.caches,
+            self.downloader,
+            self.song_renderer,
+            self.activity,
+        )
+        self._restore_task: asyncio.Task | None = None
 
     async def initialize(self):
+        if self.cfg.cache.snapshot and not self.cfg.clear_cache:
+            self._restore_task = asyncio.create_task(self.caches.load_snapshot())
+        self.hub.start()
         self._register_player()
+        upstreams = [url for player in self.players for url in player.upstreams()]
+        if "cz_card" in self.cfg.real_send_modes:
+            upstreams.append(self.sender.cz_card.API_URL)
+        self.hub.keep_warm(upstreams)
+        self.prober.start()
+        self.warmer.start()
+        self.selections.start(self.sender.on_forwarded_click)
 
     async def terminate(self):
-        await self.sender.close()
-        await self.downloader.close()
-        for parser in self.players:
-            await parser.close()
+        await self.selections.stop()
+        await self.prober.stop()
+        await self.warmer.stop()
+        await self.hub.close()
+        if self._restore_task is not None:
+            self._restore_task.cancel()
+            await asyncio.gather(self._restore_task, return_exceptions=True)
+        if self.cfg.cache.snapshot:
+            await self.caches.save_snapshot()
+        await self.caches.close()
 
     def get_player(
         self, name: str | None = None, word: str | None = None, default: bool = False
     ) -> BaseMusicPlayer | None:
         if default:
-            word = self.cfg.default_player_name
+            player = self.get_player(word=self.cfg.default_player_name)
+            if player and self.scoreboard.is_degraded(player.platform.name):
+                fallback = self.scoreboard.healthiest(self.players, exclude=player)
+                if fallback:
+                    logger.info(
+                        f"{player.platform.display_name} 不可用，"
+                        f"改用 {fallback.platform.display_name}"
+                    )
+                    return fallback
+            return player
         for player in self.players:
             if name:
                 name_ = name.strip().lower()
@@ -66,11 +119,25 @@ class MusicPlugin(Star):
         """注册音乐播放器"""
         all_subclass = BaseMusicPlayer.get_all_subclass()
         for _cls in all_subclass:
-            player = _cls(self.cfg)
+            player = _cls(self.cfg, self.hub, self.caches)
             self.players.append(player)
             self.keywords.extend(player.platform.keywords)
         logger.debug(f"已注册触发词：{self.keywords}")
 
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command("音乐缓存")
+    async def cache_stats(self, event: AstrMessageEvent):
+        """查看点歌插件各缓存的命中统计"""
+        lines = ["【缓存统计】"]
+        for name, stats in self.caches.stats().items():
+            lines.append(
+                f"{name}: 命中 {stats.hits} / 未命中 {stats.misses}"
+                f"（{stats.hit_rate:.1%}），条目 {stats.entries}，"
+                f"淘汰 {stats.evictions}"
+                + (f"，占用 {stats.bytes / 1024 / 1024:.1f}MB" if stats.bytes else "")
+            )
+        yield event.plain_result("\n".join(lines))
+
     @filter.command(
         "点歌",
         alias={
@@ -108,6 +175,7 @@ class MusicPlugin(Star):
             player = self.get_player(default=True)
         if not player:
             return
+        self.activity.touch()
         args = arg.split()
         index: int = int(args[-1]) if args[-1].isdigit() else 0
         song_name = arg.removesuffix(str(index))
@@ -143,7 +211,7 @@ class MusicPlugin(Star):
             event.stop_event()
             return
         if selection_mode not in {"image", "text"}:
-            self.sender.clear_selection_context(event)
+            await self.sender.clear_selection_context(event)
             event.stop_event()
             return
 
@@ -169,12 +237,13 @@ class MusicPlugin(Star):
                 return
             selected_song = songs[index - 1]
             controller.stop()
+            self.activity.touch()
             await self.sender.send_song(event, player, selected_song, modes=modes)
 
         try:
             await empty_mention_waiter(event)
         except TimeoutError as _:
-            self.sender.clear_selection_context(event)
+            await self.sender.clear_selection_context(event)
             yield event.plain_result("点歌超时！")
         except Exception as e:
             logger.error(traceback.format_exc())
@@ -189,6 +258,7 @@ class MusicPlugin(Star):
         if not player:
             yield event.plain_result("无可用播放器")
             return
+        self.activity.touch()
         songs = await player.fetch_songs(keyword=song_name, limit=1)
         if not songs:
             yield event.plain_result("没找到相关歌曲")
@@ -205,6 +275,7 @@ class MusicPlugin(Star):
         player = self.get_player(default=True)
         if not player:
             return "无可用播放器"
+        self.activity.touch()
         songs = await player.fetch_songs(keyword=song_name, limit=1)
         if not songs:
             return "没找到相关歌曲"
@@ -230,6 +301,7 @@ class MusicPlugin(Star):
         )
         if not player:
             return f"无可用播放器：{platform}" if platform else "无可用播放器"
+        self.activity.touch()
         songs = await player.fetch_songs(
             keyword=song_name, limit=1, extra=platform or None
         )